@@ -19,7 +19,43 @@ import time
 import subprocess
 import sys
 from datetime import datetime
-from collections import defaultdict
+from requests.adapters import HTTPAdapter
+
+from config import system_config
+from risk_manager import risk_manager
+
+# orjson 설치 시 고속 JSON 파싱 (미설치 시 표준 json 사용)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgpack 설치 시 스캔 파라미터를 바이너리 본문으로 전송 (미설치 시 JSON 본문)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# ──────────────────────────────────────────
+# 표시용 상수 (rerun마다 다시 만들지 않도록 모듈 레벨에 정의)
+# ──────────────────────────────────────────
+STRAT_NAMES = {"pullback": "눌림목", "bottom_escape": "바닥탈출", "golden_cross": "골든크로스", "breakout": "박스권돌파", "convergence": "정배열초입"}
+
+# 🔍 시장 국면 한글화 (BULL/BEAR/NEUTRAL -> 한글)
+PHASE_MAP = {
+    "BULL": "🚀 강력 상승 (매수 유리)",
+    "BEAR": "📉 하락 위축 (리스크 관리)",
+    "NEUTRAL": "☁️ 횡보 혼조 (종목 차별화)"
+}
+
+# 전략별 초보자 팁 매핑
+TIP_MAP = {
+    "눌림목": "💡 상승 중 일시적 조정 구간입니다. <b>저가 매수</b> 후 반등을 노리세요.",
+    "바닥탈출": "🌱 하락이 멈추고 반등이 시작되었습니다. <b>느긋하고 안정적인 투자</b>가 가능합니다.",
+    "골든크로스": "⚡ 추세가 상향으로 전환되었습니다. <b>거래량이 터질 때 매수</b>가 유리합니다.",
+    "박스권돌파": "🚀 저항 벽을 뚫었습니다. <b>빠른 속도로 수익</b>이 날 수 있는 구간입니다.",
+    "정배열초입": "🌊 대세 우동향 항해의 시작입니다. <b>길게 보유하여 수익을 극대화</b>하세요."
+}
 
 # ──────────────────────────────────────────
 # 페이지 설정
@@ -30,6 +66,22 @@ st.set_page_config(
     layout="wide",
 )
 
+# ──────────────────────────────────────────
+# 백엔드 통신 세션 (keep-alive 커넥션 재사용)
+# ──────────────────────────────────────────
+BACKEND_HOST = "127.0.0.1"
+BACKEND_PORT = 8000
+BACKEND_URL = f"http://{BACKEND_HOST}:{BACKEND_PORT}"
+
+@st.cache_resource
+def get_backend_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, pool_block=False)
+    session.mount("http://", adapter)
+    return session
+
+SESSION = get_backend_session()
+
 # ──────────────────────────────────────────
 # 테마 관리
 # ──────────────────────────────────────────
@@ -39,9 +91,15 @@ if "theme" not in st.session_state:
 # ──────────────────────────────────────────
 # 유틸리티: 로컬 IP 추출 (모바일 접속용)
 # ──────────────────────────────────────────
+@st.cache_data
 def get_local_ip():
+    # 서버/도커 배포 시 환경변수로 지정하면 UDP 조회 생략
+    override = os.getenv("LOCAL_IP_OVERRIDE")
+    if override:
+        return override
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.settimeout(0.5)
         s.connect(("8.8.8.8", 80))
         ip = s.getsockname()[0]
         s.close()
@@ -51,16 +109,21 @@ def get_local_ip():
 
 LOCAL_IP = get_local_ip()
 
-def check_backend_status():
+def _backend_listening():
+    """백엔드 포트 개방 여부만 확인 (HTTP 요청 없이 TCP 연결 시도)"""
     try:
-        r = requests.get(f"{BACKEND_URL}/api/progress", timeout=2)
-        return True
-    except:
+        with socket.create_connection((BACKEND_HOST, BACKEND_PORT), timeout=0.2):
+            return True
+    except OSError:
         return False
 
+@st.cache_data(ttl=2)
+def check_backend_status():
+    return _backend_listening()
+
 def start_backend_processes():
     """백엔드 서버 및 에이전트 자동 실행 (24시간 서버 대응)"""
-    if not check_backend_status():
+    if not _backend_listening():
         # server.py 실행
         subprocess.Popen([sys.executable, "server.py"], 
                          stdout=subprocess.DEVNULL, 
@@ -71,18 +134,17 @@ def start_backend_processes():
                          stdout=subprocess.DEVNULL, 
                          stderr=subprocess.DEVNULL,
                          creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-        time.sleep(3) # 서버 부팅 대기
 
-# 앱 시작 시 백엔드 자동 가동
+# 앱 시작 시 백엔드 자동 가동 (첫 화면 렌더링을 막지 않도록 백그라운드 스레드에서 실행)
 if "processes_checked" not in st.session_state:
-    start_backend_processes()
+    threading.Thread(target=start_backend_processes, daemon=True).start()
     st.session_state.processes_checked = True
+    st.session_state.backend_launch_time = time.time()
 
 # ──────────────────────────────────────────
 # 프리미엄 CSS (Aesthetics focus)
 # ──────────────────────────────────────────
-def inject_premium_css_v4():
-    theme = st.session_state.theme
+def _theme_palette(theme: str) -> dict:
     if theme == "dark":
         bg = "#0f172a"
         card_bg = "linear-gradient(145deg, #1e293b, #0f172a)"
@@ -104,13 +166,21 @@ def inject_premium_css_v4():
         shadow = "rgba(0, 0, 0, 0.05)"
         header_text = "#0f172a"
 
-    # 전역 사용을 위해 session_state에 저장
-    st.session_state.theme_colors = {
+    return {
         "bg": bg, "card_bg": card_bg, "text": text, "text_dim": text_dim,
-        "border": border, "accent": accent, "sub_card": sub_card, "header_text": header_text
+        "border": border, "accent": accent, "sub_card": sub_card,
+        "shadow": shadow, "header_text": header_text
     }
 
-    st.markdown(f"""
+@st.cache_data
+def _build_css(theme: str) -> str:
+    """테마별 CSS 문자열 (테마당 한 번만 생성)"""
+    c = _theme_palette(theme)
+    bg, card_bg, text, text_dim = c["bg"], c["card_bg"], c["text"], c["text_dim"]
+    border, accent, sub_card = c["border"], c["accent"], c["sub_card"]
+    shadow, header_text = c["shadow"], c["header_text"]
+
+    return f"""
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Pretendard:wght@400;600;700;800&family=Outfit:wght@400;600;800&display=swap');
     
@@ -199,35 +269,76 @@ def inject_premium_css_v4():
 
     .strat-label {{ font-size: 0.7rem; font-weight: 800; color: {text_dim} !important; margin-bottom: 2px; text-transform: uppercase; }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def inject_premium_css_v4():
+    theme = st.session_state.theme
+    # 전역 사용을 위해 session_state에 저장 (테마가 바뀔 때만 갱신)
+    if st.session_state.get("theme_colors_for") != theme:
+        st.session_state.theme_colors = _theme_palette(theme)
+        st.session_state.theme_colors_for = theme
+    # Streamlit은 매 rerun마다 페이지를 다시 그리므로 CSS 자체는 매번 출력해야 함
+    st.markdown(_build_css(theme), unsafe_allow_html=True)
 
 inject_premium_css_v4()
 
 # ──────────────────────────────────────────
 # 데이터 수집 (타임스탬프 포함)
 # ──────────────────────────────────────────
-BACKEND_URL = "http://127.0.0.1:8000"
+@st.cache_data(max_entries=4)
+def _scan_newest_result(dir_path: str, dir_mtime_ns: int):
+    """scan_result_*.json 중 가장 최근 파일 (디렉토리 mtime 기준 캐시)"""
+    best, best_m = None, -1
+    with os.scandir(dir_path) as it:
+        for e in it:
+            if e.name.startswith("scan_result_") and e.name.endswith(".json"):
+                m = e.stat().st_mtime_ns
+                if m > best_m:
+                    best, best_m = e.path, m
+    return best, best_m
+
+def find_newest_result():
+    """최신 결과 파일 (경로, mtime_ns) — 파일 추가/삭제가 없으면 scandir 생략
+    결과 폴더가 비어 있으면 이전 버전 호환을 위해 현재 폴더에서 탐색"""
+    for d in (system_config.results_dir, "."):
+        if os.path.isdir(d):
+            newest, mtime_ns = _scan_newest_result(d, os.stat(d).st_mtime_ns)
+            if newest:
+                return newest, mtime_ns
+    return None, -1
+
+@st.cache_data(max_entries=2)
+def _load_signals(path: str, mtime_ns: int) -> list:
+    """결과 파일 파싱 (파일 mtime이 바뀔 때만 다시 읽음) — 같은 시각의 .msgpack 이 있으면 우선"""
+    try:
+        packed = path[:-len(".json")] + ".msgpack"
+        if msgpack and os.path.exists(packed):
+            try:
+                with open(packed, "rb") as f:
+                    return msgpack.unpackb(f.read(), strict_map_key=False).get("signals", [])
+            except: pass  # 기록 중인 파일 등 → JSON 으로
+        if orjson:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read()).get("signals", [])
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("signals", [])
+    except: return []
 
 @st.cache_data(ttl=5)
+def _load_market():
+    try: return risk_manager.analyze_market_condition()
+    except: return None
+
 def load_quant_data():
     signals = []
-    market = None
     last_update = "분석 전"
     
-    files = sorted([f for f in os.listdir(".") if f.startswith("scan_result_")], reverse=True)
-    if files:
-        try:
-            mtime = os.path.getmtime(files[0])
-            last_update = datetime.fromtimestamp(mtime).strftime("%H:%M:%S")
-            with open(files[0], encoding="utf-8") as f:
-                signals = json.load(f).get("signals", [])
-        except: pass
-    
-    from risk_manager import risk_manager
-    try: market = risk_manager.analyze_market_condition()
-    except: pass
+    newest, mtime_ns = find_newest_result()
+    if newest:
+        last_update = datetime.fromtimestamp(mtime_ns / 1e9).strftime("%H:%M:%S")
+        signals = _load_signals(newest, mtime_ns)
     
-    return signals, market, last_update
+    return signals, _load_market(), last_update
 
 raw_sigs, m_data, update_time = load_quant_data()
 
@@ -291,8 +402,13 @@ with st.sidebar:
     
     if st.button("🚀 AI 분석 엔진 가동 (Deep Scan)", type="primary", use_container_width=True):
         # 백그라운드 스캔 실행용 함수
-        def run_scan_request(p):
-            try: requests.get(f"{BACKEND_URL}/api/scan", params=p, timeout=200)
+        def run_scan_request(p, v):
+            try:
+                if msgpack:
+                    SESSION.post(f"{BACKEND_URL}/api/scan", params=p, data=msgpack.packb(v),
+                                 headers={"Content-Type": "application/msgpack"}, timeout=200)
+                else:
+                    SESSION.post(f"{BACKEND_URL}/api/scan", params=p, json=v, timeout=200)
             except: pass
 
         # 모든 전략 항상 분석하되 동적 파라미터 적용
@@ -301,47 +417,65 @@ with st.sidebar:
             "min_market_cap": f_mcap * 100000000, 
             "top_rank": f_rank, 
             "strats": ",".join(all_strats),
-            "vars": json.dumps(strat_vars)
         }
         
-        # 스레드 시작
-        scan_thread = threading.Thread(target=run_scan_request, args=(scan_params,))
+        # 스레드 시작 (전략 파라미터는 쿼리스트링 대신 요청 본문으로 전달)
+        scan_thread = threading.Thread(target=run_scan_request, args=(scan_params, strat_vars))
         scan_thread.start()
 
         # 실시간 진행률 표시를 위한 위젯
         p_bar = st.progress(0, text="분석 대기 중...")
+
+        # 전략별 미니 진행률 — 레이아웃은 한 번만 만들고 루프에서는 값만 갱신
+        s_bars = {}
+        with st.empty().container():
+            for s_col, (sk, sn) in zip(st.columns(5), STRAT_NAMES.items()):
+                s_col.markdown(f'<div class="strat-label">{sn}</div>', unsafe_allow_html=True)
+                s_bars[sk] = s_col.progress(0)
         p_msg = st.empty()
+        LOG_PRE_STYLE = "margin:0; background:none; font-size:0.85rem; line-height:1.6; color:#6366f1; white-space:pre-wrap"
+
+        # 진행 상황이 멈춰 있으면 폴링 간격을 점진적으로 늘림 (0.8s → 최대 2.5s)
+        sleep_s = 0.8
+        last_pct, last_logs, last_strat = None, None, None
+
+        # 진행률은 대기(back-off) 이후에 조회해야 화면이 한 주기 전 스냅샷을 그리지 않음
+        poll_url = f"{BACKEND_URL}/api/progress"
 
         while scan_thread.is_alive():
             try:
-                prog = requests.get(f"{BACKEND_URL}/api/progress", timeout=2).json()
+                prog = SESSION.get(poll_url, timeout=2).json()
                 pct = prog.get("percent", 0)
                 active_logs = prog.get("active_logs", [])
                 strat_prog = prog.get("strategy_progress", {})
+
+                if pct == last_pct and active_logs == last_logs and strat_prog == last_strat:
+                    sleep_s = min(sleep_s * 1.5, 2.5)
+                    time.sleep(sleep_s)
+                    continue
+                sleep_s = 0.8
+                strat_changed = strat_prog != last_strat
+                last_pct, last_logs, last_strat = pct, active_logs, strat_prog
                 
                 # 프로그레스 바 및 멀티 로그 업데이트
                 p_bar.progress(pct / 100, text=f"분석 진행 중... {pct}%")
                 
                 # 전략별 미니 진행률 표시
-                if strat_prog:
-                    s_cols = st.columns(5)
-                    s_names = {"pullback": "눌림목", "bottom_escape": "바닥탈출", "golden_cross": "골든크로스", "breakout": "박스권돌파", "convergence": "정배열초입"}
-                    for i, (sk, sn) in enumerate(s_names.items()):
-                        with s_cols[i]:
-                            spct = strat_prog.get(sk, 0)
-                            st.markdown(f'<div class="strat-label">{sn}</div>', unsafe_allow_html=True)
-                            st.progress(spct / 100)
-
-                log_html = "".join([f'<div style="font-size:0.85rem; margin-bottom:4px; color:#6366f1">{log}</div>' for log in active_logs])
+                if strat_prog and strat_changed:
+                    for sk, bar in s_bars.items():
+                        bar.progress(strat_prog.get(sk, 0) / 100)
+
+                # 로그는 줄바꿈으로 이어 붙여 <pre> 블록 하나로 출력 (항목별 HTML 생성 생략)
+                log_text = "\n".join(active_logs)
                 p_msg.markdown(f"""
                 <div style="background:rgba(99, 102, 241, 0.05); padding:18px; border-radius:16px; border:1px solid rgba(99, 102, 241, 0.2); margin:10px 0">
                     <div style="font-size:0.75rem; color:#94a3b8; margin-bottom:8px; font-weight:800; text-transform:uppercase; letter-spacing:1px">실시간 병렬 분석 로그</div>
-                    {log_html if log_html else '<div style="color:#94a3b8">엔진 가동 준비 중...</div>'}
+                    {f'<pre style="{LOG_PRE_STYLE}">{log_text}</pre>' if log_text else '<div style="color:#94a3b8">엔진 가동 준비 중...</div>'}
                 </div>
                 """, unsafe_allow_html=True)
             except:
                 pass
-            time.sleep(0.8)
+            time.sleep(sleep_s)
 
         st.success("✅ 심층 분석이 완료되었습니다!")
         st.cache_data.clear()
@@ -353,18 +487,16 @@ with st.sidebar:
 
 # 백엔드 서버 상태 체크
 if not check_backend_status():
-    st.error("⚠️ [알림] 분석 엔진 서버(8000)가 작동하지 않고 있습니다. 노트북에서 'server.py'를 실행해 주세요.")
+    # 자동 기동 직후에는 서버 부팅 시간을 기다리는 중이므로 안내만 표시
+    if time.time() - st.session_state.get("backend_launch_time", 0) < 30:
+        st.info("⏳ 분석 엔진 기동 중입니다... 잠시 후 화면을 새로고침해 주세요.")
+    else:
+        st.error("⚠️ [알림] 분석 엔진 서버(8000)가 작동하지 않고 있습니다. 노트북에서 'server.py'를 실행해 주세요.")
 
 if m_data:
     st.markdown("### 📊 실시간 증시 요약")
     
-    # 🔍 시장 국면 한글화 (BULL/BEAR/NEUTRAL -> 한글)
-    phase_map = {
-        "BULL": "🚀 강력 상승 (매수 유리)",
-        "BEAR": "📉 하락 위축 (리스크 관리)",
-        "NEUTRAL": "☁️ 횡보 혼조 (종목 차별화)"
-    }
-    korean_phase = phase_map.get(m_data.market_phase, f"상태 확인 중 ({m_data.market_phase})")
+    korean_phase = PHASE_MAP.get(m_data.market_phase, f"상태 확인 중 ({m_data.market_phase})")
     
     h1, h2, h3, h4 = st.columns(4)
     with h1: st.markdown(f'<div class="p-card"><div class="metric-title">KOSPI 지수</div><div class="metric-value">{m_data.kospi_value:,.1f}</div></div>', unsafe_allow_html=True)
@@ -398,56 +530,21 @@ with st.expander("📚 [초보자 필독] 시스템 사용법 및 전략 가이
 # ══════════════════════════════════════
 st.markdown("### 🚀 금일 최우선 공략 종목")
 
-def format_price(v):
-    try: return f"{int(float(v)):,}"
-    except: return "—"
-
-grouped = defaultdict(list)
-for s in raw_sigs: grouped[s.get('ticker', '000000')].append(s)
-
-if not grouped:
-    st.info("현재 분석된 종목이 없습니다. 왼쪽 '분석 엔진 가동'을 눌러주세요.")
-else:
-    g_cols = st.columns(2)
-    for idx, (ticker, signals) in enumerate(grouped.items()):
-        main = signals[0]
-        st_names = list(set([s.get('strategy', '—') for s in signals]))
-        is_best = main.get('grade') in ('S', 'A')
-        m_cap = main.get('market_cap', 0)
-        m_cap_str = f"{format_price(m_cap // 100000000)}억" if m_cap > 0 else "—"
-        
-        with g_cols[idx % 2]:
-            tags = " ".join([f'<span class="p-pill">{name}</span>' for name in st_names])
-            
-            # 전략별 초보자 팁 매핑
-            tip_map = {
-                "눌림목": "💡 상승 중 일시적 조정 구간입니다. <b>저가 매수</b> 후 반등을 노리세요.",
-                "바닥탈출": "🌱 하락이 멈추고 반등이 시작되었습니다. <b>느긋하고 안정적인 투자</b>가 가능합니다.",
-                "골든크로스": "⚡ 추세가 상향으로 전환되었습니다. <b>거래량이 터질 때 매수</b>가 유리합니다.",
-                "박스권돌파": "🚀 저항 벽을 뚫었습니다. <b>빠른 속도로 수익</b>이 날 수 있는 구간입니다.",
-                "정배열초입": "🌊 대세 우동향 항해의 시작입니다. <b>길게 보유하여 수익을 극대화</b>하세요."
-            }
-            # 첫 번째 전략의 팁을 대표로 노출
-            current_tip = tip_map.get(st_names[0], "실시간 수급을 확인하며 분할 매수로 접근하세요.")
-
-            # 분석 근거 (Reasons) 추출
-            reason_list = main.get('reasons', [])
-            reason_html = "".join([f'<div style="font-size:0.75rem; color:#94a3b8; margin-bottom:4px">◦ {r}</div>' for r in reason_list])
-            
-            card_html = f"""<div class="p-card" style="position:relative">
-<div class="confidence-badge">{main.get('confidence', 0):.0f}%</div>
+# 종목 카드 템플릿 (format_map으로 한 번에 치환)
+CARD_TMPL = """<div class="p-card" style="position:relative">
+<div class="confidence-badge">{confidence:.0f}%</div>
 <div style="display:flex; justify-content:space-between; align-items:flex-start; margin-bottom:15px">
 <div>
-<span style="font-size:1.5rem; font-weight:800">{main.get('name')}</span>
+<span style="font-size:1.5rem; font-weight:800">{name}</span>
 <span style="color:#94a3b8; font-size:1rem; margin-top:4px; display:block">{ticker}</span>
 </div>
-<div style="font-size:1.8rem; font-weight:800; color:#6366f1; font-family: Outfit; margin-right:60px">{format_price(main.get('current_price'))}원</div>
+<div style="font-size:1.8rem; font-weight:800; color:#6366f1; font-family: Outfit; margin-right:60px">{price}원</div>
 </div>
 <div style="display:flex; gap:10px; margin-bottom:15px; flex-wrap:wrap">{tags}</div>
 
 <div style="background:rgba(99, 102, 241, 0.05); border-radius:12px; padding:12px; margin-bottom:15px; border:1px dashed rgba(99, 102, 241, 0.2)">
     <div style="font-size:0.75rem; font-weight:800; color:#6366f1; margin-bottom:6px">📊 AI 분석 근거 (기술적 지표)</div>
-    {reason_html if reason_html else '<div style="font-size:0.75rem; color:#94a3b8">주요 기술적 지표 밀집 구간 통과 중</div>'}
+    {reason_html}
 </div>
 
 <div style="background:rgba(16, 185, 129, 0.05); padding:10px 14px; border-radius:12px; margin-bottom:15px; font-size:0.75rem; color:#10b981; border:1px solid rgba(16, 185, 129, 0.1)">
@@ -456,16 +553,16 @@ else:
 
 <div class="status-bar">
 <svg style="width:20px;height:20px" fill="currentColor" viewBox="0 0 20 20"><path d="M11 3a1 1 0 10-2 0v1a1 1 0 102 0V3zM15.657 5.757a1 1 0 00-1.414-1.414l-.707.707a1 1 0 001.414 1.414l.707-.707zM18 10a1 1 0 01-1 1h-1a1 1 0 110-2h1a1 1 0 011 1zM5.05 6.464A1 1 0 106.464 5.05l-.707-.707a1 1 0 00-1.414 1.414l.707.707zM5 10a1 1 0 01-1 1H3a1 1 0 110-2h1a1 1 0 011 1zM8 16v-1a1 1 0 112 0v1a1 1 0 11-2 0zM13.536 15.657a1 1 0 001.414-1.414l-.707-.707a1 1 0 00-1.414 1.414l.707.707zM16.464 13.536a1 1 0 00-1.414-1.414l-.707.707a1 1 0 001.414 1.414l.707-.707z"></path></svg>
-수급: {main.get('supply_acceleration', '정상 유입 중')}
+수급: {supply}
 </div>
 <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px; margin-top:10px">
 <div style="text-align:center; padding:12px; background:rgba(239, 68, 68, 0.05); border-radius:16px; border:1px solid rgba(239, 68, 68, 0.1)">
 <div style="font-size:0.75rem; color:#ef4444; font-weight:700">손절가</div>
-<div style="font-weight:800; color:#ef4444; font-size:1.2rem">{format_price(main.get('stop_loss'))}</div>
+<div style="font-weight:800; color:#ef4444; font-size:1.2rem">{stop_loss}</div>
 </div>
 <div style="text-align:center; padding:12px; background:rgba(16, 185, 129, 0.05); border-radius:16px; border:1px solid rgba(16, 185, 129, 0.1)">
 <div style="font-size:0.75rem; color:#10b981; font-weight:700">목표가</div>
-<div style="font-weight:800; color:#10b981; font-size:1.2rem">{format_price(main.get('target_price_1'))}</div>
+<div style="font-weight:800; color:#10b981; font-size:1.2rem">{target}</div>
 </div>
 <div style="text-align:center; padding:12px; background:rgba(99, 102, 241, 0.05); border-radius:16px; border:1px solid rgba(99, 102, 241, 0.1)">
 <div style="font-size:0.75rem; color:#6366f1; font-weight:700">시총</div>
@@ -473,26 +570,82 @@ else:
 </div>
 </div>
 </div>"""
-            st.markdown(card_html, unsafe_allow_html=True)
+REASON_EMPTY_HTML = '<div style="font-size:0.75rem; color:#94a3b8">주요 기술적 지표 밀집 구간 통과 중</div>'
+
+def format_price(v, _isinstance=isinstance, _int=int):
+    if v is None: return "—"
+    if _isinstance(v, _int): return f"{v:,}"  # 정수는 float 변환 생략
+    try: return f"{_int(float(v)):,}"
+    except: return "—"
+
+grouped = {}
+for s in raw_sigs: grouped.setdefault(s.get('ticker', '000000'), []).append(s)
+
+if not grouped:
+    st.info("현재 분석된 종목이 없습니다. 왼쪽 '분석 엔진 가동'을 눌러주세요.")
+else:
+    # 카드 HTML을 좌/우 컬럼별로 모아 컬럼당 한 번만 출력
+    col_html = ([], [])
+    for idx, (ticker, signals) in enumerate(grouped.items()):
+        main = signals[0]
+        st_names = list(dict.fromkeys(s.get('strategy', '—') for s in signals))
+        is_best = main.get('grade') in ('S', 'A')
+        m_cap = main.get('market_cap', 0)
+        m_cap_str = f"{format_price(m_cap // 100000000)}억" if m_cap > 0 else "—"
+        
+        tags = " ".join([f'<span class="p-pill">{name}</span>' for name in st_names])
+        
+        # 첫 번째 전략의 팁을 대표로 노출
+        current_tip = TIP_MAP.get(st_names[0], "실시간 수급을 확인하며 분할 매수로 접근하세요.")
+
+        # 분석 근거 (Reasons) 추출
+        reason_list = main.get('reasons', [])
+        reason_html = "".join([f'<div style="font-size:0.75rem; color:#94a3b8; margin-bottom:4px">◦ {r}</div>' for r in reason_list])
+        
+        card_html = CARD_TMPL.format_map({
+            "confidence": main.get('confidence', 0),
+            "name": main.get('name'),
+            "ticker": ticker,
+            "price": format_price(main.get('current_price')),
+            "tags": tags,
+            "reason_html": reason_html or REASON_EMPTY_HTML,
+            "current_tip": current_tip,
+            "supply": main.get('supply_acceleration', '정상 유입 중'),
+            "stop_loss": format_price(main.get('stop_loss')),
+            "target": format_price(main.get('target_price_1')),
+            "m_cap_str": m_cap_str,
+        })
+        col_html[idx % 2].append(card_html)
+
+    for col, cards in zip(st.columns(2), col_html):
+        col.markdown("".join(cards), unsafe_allow_html=True)
 
 # ══════════════════════════════════════
 # [5] 리스트 섹션 (TOP 100)
 # ══════════════════════════════════════
+# 테마 색상은 %(...)s 로 한 번 치환하고, 종목 값은 {…} 로 행마다 치환
+ROW_TMPL = """
+            <div style="padding:15px; border-bottom:1px solid %(border)s; display:flex; justify-content:space-between; font-size:0.9rem">
+                <span><b>{rank}. {name}</b> <small style="color:%(text_dim)s"> {ticker}</small></span>
+                <span style="color:#6366f1; font-weight:800">{confidence:.0f}%%</span>
+            </div>"""
+
 st.divider()
 st.markdown("### 🔝 데이터 신뢰도 순위 (TOP 100)")
 if raw_sigs:
     tops = sorted(raw_sigs, key=lambda x: x.get('confidence', 0), reverse=True)[:100]
     # 테마 변수 재로드 (for NameError 방지)
     t_colors = st.session_state.theme_colors
-    l_cols = st.columns(4)
-    for i, s in enumerate(tops):
-        with l_cols[i % 4]:
-            st.markdown(f"""
-            <div style="padding:15px; border-bottom:1px solid {t_colors['border']}; display:flex; justify-content:space-between; font-size:0.9rem">
-                <span><b>{i+1}. {s.get('name')}</b> <small style="color:{t_colors['text_dim']}"> {s.get('ticker')}</small></span>
-                <span style="color:#6366f1; font-weight:800">{s.get('confidence', 0):.0f}%</span>
-            </div>
-            """, unsafe_allow_html=True)
+    # 4열 그리드를 하나의 HTML 블록으로 출력 (행 단위 배치 = 기존 i % 4 컬럼 배치와 동일)
+    row_tmpl = ROW_TMPL % {"border": t_colors['border'], "text_dim": t_colors['text_dim']}
+    rows_html = "".join(
+        row_tmpl.format(rank=i + 1, name=s.get('name'), ticker=s.get('ticker'), confidence=s.get('confidence', 0))
+        for i, s in enumerate(tops)
+    )
+    st.markdown(
+        f'<div style="display:grid; grid-template-columns:repeat(4, 1fr); column-gap:1rem">{rows_html}</div>',
+        unsafe_allow_html=True,
+    )
 else:
     st.caption("데이터가 없습니다. 분석 엔진을 실행해 주세요.")
 
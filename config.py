@@ -5,9 +5,13 @@
 ╚══════════════════════════════════════════════════════════╝
 """
 import os
+import sys
 from dataclasses import dataclass, field
 from typing import Optional
 
+# 결과 객체용 dataclass 옵션 — Python 3.10+ 에서는 __slots__ 생성 (인스턴스 __dict__ 생략)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 # .env 파일에서 환경변수 로딩
 try:
     from dotenv import load_dotenv
@@ -164,6 +168,10 @@ class SystemConfig:
     dashboard_port: int = 8000
     timezone: str = "Asia/Seoul"
     db_path: str = "quant_trading.db"          # SQLite DB 경로
+    results_dir: str = "results"               # 스캔 결과(scan_result_*.json) 저장 폴더
+    cache_dir: str = os.getenv(                # KIS 토큰 등 자격증명 캐시 폴더 (저장소 밖)
+        "QUANT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "quant_trading")
+    )
     stop_loss_pct: float = -3.0                # 손절 기준 퍼센트
     ma_stop_period: int = 20                   # 이동평균선 이탈 감시 기간
     daily_report_hour: int = 17                # 일일 보고서 전송 시각
@@ -6,17 +6,45 @@
 ╚══════════════════════════════════════════════════════════╝
 """
 import os
+import re
+import asyncio
 import time
 import json
 import logging
+import threading
+import functools
 import requests
 import pandas as pd
 import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from operator import itemgetter
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Tuple
 from io import StringIO
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
-from config import kis_config, filter_config
+from config import kis_config, filter_config, system_config
+
+# orjson 설치 시 고속 JSON 파싱 (미설치 시 requests 내장 json 사용)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx 설치 시 비동기 일괄 조회 지원 (미설치 시 스레드풀 사용)
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 토큰 파일 잠금용 (Windows 미지원 → 프로세스 내 잠금만 사용)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +55,121 @@ KRX_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Referer": "http://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd",
     "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Encoding": "gzip, deflate",
     "X-Requested-With": "XMLHttpRequest",
 }
 
+# KRX 시장 구분 (mktId, 시장명)
+KRX_MARKETS = (("STK", "KOSPI"), ("KSQ", "KOSDAQ"))
+MARKET_CATEGORIES = [name for _, name in KRX_MARKETS]
+
+# KRX 응답 컬럼 → 한글 컬럼명 (시가총액 MDCSTAT01501 / 지수 MDCSTAT00301)
+_MKTCAP_COL_MAP = MappingProxyType({
+    "ISU_SRT_CD": "종목코드",
+    "ISU_ABBRV": "종목명",
+    "TDD_CLSPRC": "종가",
+    "MKTCAP": "시가총액",
+    "ACC_TRDVAL": "거래대금",
+    "ACC_TRDVOL": "거래량",
+    "FLUC_RT": "등락률",
+    "LIST_SHRS": "상장주식수",
+})
+_INDEX_COL_MAP = MappingProxyType({
+    "TRD_DD": "날짜",
+    "CLSPRC_IDX": "종가",
+    "OPNPRC_IDX": "시가",
+    "HGPRC_IDX": "고가",
+    "LWPRC_IDX": "저가",
+    "ACC_TRDVOL": "거래량",
+    "ACC_TRDVAL": "거래대금",
+})
+
+# 주요 종목명 기본값 (KRX 조회 실패 시에도 이름 표시)
+_WELL_KNOWN = MappingProxyType({
+    "005930": "삼성전자", "000660": "SK하이닉스",
+    "373220": "LG에너지솔루션", "207940": "삼성바이오로직스",
+    "005380": "현대차", "006400": "삼성SDI",
+    "035420": "NAVER", "051910": "LG화학",
+    "068270": "셀트리온", "028260": "삼성물산",
+    "035720": "카카오", "105560": "KB금융",
+    "055550": "신한지주", "066570": "LG전자",
+    "003670": "포스코퓨처엠", "000270": "기아",
+    "012330": "현대모비스", "096770": "SK이노베이션",
+    "034730": "SK", "015760": "한국전력",
+})
+
+# 종목명 캐시 파일 (JSONL 추가 기록 — 이 줄 수 이상이면 전체 스냅샷으로 압축)
+LEGACY_NAMES_FILE = "ticker_names.json"
+NAMES_COMPACT_LINES = 50
+
+# ETF/ETN 브랜드 키워드 (종목명 필터용, 1회 컴파일)
+ETF_KEYWORDS = ("ETF", "ETN", "KODEX", "TIGER", "KBSTAR", "ARIRANG", "SOL", "PLUS")
+_ETF_RE = re.compile("|".join(map(re.escape, ETF_KEYWORDS)))
+
+# KIS 일봉 응답 필드 → 컬럼명
+OHLCV_FIELDS = (
+    ("시가", "stck_oprc"),
+    ("고가", "stck_hgpr"),
+    ("저가", "stck_lwpr"),
+    ("종가", "stck_clpr"),
+    ("거래량", "acml_vol"),
+    ("거래대금", "acml_tr_pbmn"),
+)
+_OHLCV_KEYS = ("stck_bsop_date",) + tuple(field for _, field in OHLCV_FIELDS)
+_OHLCV_GETTER = itemgetter(*_OHLCV_KEYS)
+
+
+def _create_session() -> requests.Session:
+    """KRX/KIS 공용 HTTP 세션 (keep-alive 커넥션 풀 + 일시 오류 재시도)"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+SESSION = _create_session()
+
+
+def _parse(resp: requests.Response):
+    """응답 본문 JSON 파싱 (orjson 우선)"""
+    if orjson:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+# KIS REST 초당 호출 제한(~20건) 대응 — 동시 요청 수 상한
+KIS_MAX_CONCURRENCY = 20
+_kis_slots = threading.BoundedSemaphore(KIS_MAX_CONCURRENCY)
+
+
+class _RateLimiter:
+    """초당 호출 수 제한 (토큰 버킷 — 버스트 burst건 후 rate건/초, 스레드·코루틴 공용)"""
+
+    def __init__(self, rate: float, burst: int):
+        self._interval = 1.0 / rate
+        self._burst = burst
+        self._next = 0.0  # 다음 토큰 가용 시각 (monotonic)
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 1개 예약 → 사용 가능까지 대기할 초 (0이면 즉시)"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now - self._interval * (self._burst - 1))
+            self._next = start + self._interval
+            return max(0.0, start - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# 동시 요청 수와 별개로 초당 호출 수 자체를 제한 (스캐너 작업 스레드 / 배치 / 비동기 조회 공통)
+_kis_rate = _RateLimiter(rate=KIS_MAX_CONCURRENCY, burst=KIS_MAX_CONCURRENCY)
+
 
 def krx_post(bld: str, params: dict) -> pd.DataFrame:
     """KRX API에 POST 요청하여 DataFrame 반환"""
@@ -37,9 +177,9 @@ def krx_post(bld: str, params: dict) -> pd.DataFrame:
     payload = {"bld": bld}
     payload.update(params)
     try:
-        resp = requests.post(url, data=payload, headers=KRX_HEADERS, timeout=15)
+        resp = SESSION.post(url, data=payload, headers=KRX_HEADERS, timeout=15)
         resp.raise_for_status()
-        data = resp.json()
+        data = _parse(resp)
         # KRX returns {"OutBlock_1": [...]} or {"block1": [...]}
         for key in ["OutBlock_1", "block1", "output"]:
             if key in data:
@@ -53,34 +193,188 @@ def krx_post(bld: str, params: dict) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def _to_num(s: pd.Series) -> pd.Series:
+    """KRX 천단위 콤마 문자열 → 숫자 (정규식 없이 리터럴 치환)"""
+    return pd.to_numeric(s.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+
+def _pct_change(close: np.ndarray) -> np.ndarray:
+    """전일 대비 등락률(%) — 첫 행은 NaN (pandas pct_change() * 100 과 동일)"""
+    ret = np.empty_like(close)
+    ret[0] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(close[1:], close[:-1], out=ret[1:])
+    ret[1:] -= 1.0
+    ret *= 100.0
+    return ret
+
+
+def _dumps(obj) -> bytes:
+    """JSON 직렬화 (orjson 우선, 한글 그대로 UTF-8)"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# ──────────────────────────────────────────
+# KIS 시세 응답 output 블록 → dict (동기/비동기 공용)
+# ──────────────────────────────────────────
+def _investor_from_output(output: dict) -> dict:
+    return {
+        "외인순매수": int(output.get("frgn_ntby_qty", 0)),
+        "기관순매수": int(output.get("orgn_ntby_qty", 0)),
+        "외인보유비중": float(output.get("frgn_stkn_rto", 0)),
+    }
+
+
+def _price_from_output(output: dict) -> dict:
+    return {
+        "현재가": int(output.get("stck_prpr", 0)),
+        "등락률": float(output.get("prdy_ctrt", 0)),
+        "거래량": int(output.get("acml_vol", 0)),
+        "거래대금": int(output.get("acml_tr_pbmn", 0)),
+        "시가": int(output.get("stck_oprc", 0)),
+        "고가": int(output.get("stck_hgpr", 0)),
+        "저가": int(output.get("stck_lwpr", 0)),
+        "체결강도": float(output.get("seln_cnqn_smtn", 0)),
+    }
+
+
+def _program_from_output(output: dict) -> dict:
+    return {
+        "프로그램매수": int(output.get("pgmn_buy_qty", 0)),
+        "프로그램매도": int(output.get("pgmn_sell_qty", 0)),
+        "프로그램순매수": int(output.get("pgmn_ntby_qty", 0)),
+    }
+
+
+def _ttl_cache(seconds: int = 30):
+    """
+    DataCollector 메서드용 종목별 단기 캐시 (self._cache 공유, force=True 시 우회)
+    같은 키를 여러 스레드가 동시에 놓치면 첫 호출만 조회하고 나머지는 그 결과를 기다림
+    """
+    def decorator(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(self, ticker: str, *args, force: bool = False, **kwargs):
+            cache_key = f"{name}_{ticker}"
+            if not force and cache_key in self._cache:
+                ts, value = self._cache[cache_key]
+                if time.monotonic() - ts < seconds:
+                    return value
+
+            with self._inflight_lock:
+                fut = self._inflight.get(cache_key)
+                owner = fut is None
+                if owner:
+                    fut = self._inflight[cache_key] = Future()
+            if not owner:
+                return fut.result()
+
+            try:
+                value = fn(self, ticker, *args, **kwargs)
+                if len(value):  # 조회 실패(빈 결과)는 캐시하지 않음
+                    self._cache[cache_key] = (time.monotonic(), value)
+                fut.set_result(value)
+                return value
+            except BaseException as e:
+                fut.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(cache_key, None)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타 잠금 (fcntl 미지원 환경에서는 잠금 없이 진행)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
 class KISAuth:
     """한국투자증권 API 인증 관리"""
 
-    def __init__(self):
+    def __init__(self, token_file: Optional[str] = None):
         self.access_token: Optional[str] = None
         self.token_expires: Optional[datetime] = None
+        # 기본 위치는 저장소 밖 캐시 폴더 (실수로 커밋되지 않도록)
+        if token_file is None:
+            try:
+                os.makedirs(system_config.cache_dir, mode=0o700, exist_ok=True)
+            except OSError:
+                pass
+            token_file = os.path.join(system_config.cache_dir, "kis_token.json")
+        self.token_file = token_file
+        self._lock = threading.Lock()
+        self._load_token()
+
+    def _token_valid(self) -> bool:
+        return bool(self.access_token and self.token_expires and datetime.now() < self.token_expires)
+
+    def _load_token(self):
+        """파일에서 토큰 로드 (프로세스 간 공유용, 만료/다른 앱키는 무시)"""
+        try:
+            with open(self.token_file, "rb") as f:
+                data = json.loads(f.read())
+            expires = datetime.fromisoformat(data["token_expires"])
+            if data.get("app_key") == kis_config.app_key and datetime.now() < expires:
+                self.access_token = data["access_token"]
+                self.token_expires = expires
+        except: pass
+
+    def _save_token(self):
+        """토큰을 임시 파일(소유자 전용 0600)에 쓴 뒤 원자적으로 교체"""
+        tmp = f"{self.token_file}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "app_key": kis_config.app_key,
+                    "access_token": self.access_token,
+                    "token_expires": self.token_expires.isoformat(),
+                }, f)
+            os.replace(tmp, self.token_file)
+        except: pass
 
     def get_token(self) -> str:
-        if self.access_token and self.token_expires and datetime.now() < self.token_expires:
+        if self._token_valid():
             return self.access_token
 
-        url = f"{kis_config.base_url}/oauth2/tokenP"
-        payload = {
-            "grant_type": "client_credentials",
-            "appkey": kis_config.app_key,
-            "appsecret": kis_config.app_secret,
-        }
-        try:
-            resp = requests.post(url, json=payload, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            self.access_token = data["access_token"]
-            self.token_expires = datetime.now() + timedelta(hours=23)
-            logger.info("KIS 토큰 발급 완료")
-            return self.access_token
-        except Exception as e:
-            logger.error(f"KIS 토큰 발급 실패: {e}")
-            return ""
+        with self._lock, _file_lock(f"{self.token_file}.lock"):
+            # 대기 중 다른 스레드/프로세스가 갱신했으면 재사용
+            self._load_token()
+            if self._token_valid():
+                return self.access_token
+
+            url = f"{kis_config.base_url}/oauth2/tokenP"
+            payload = {
+                "grant_type": "client_credentials",
+                "appkey": kis_config.app_key,
+                "appsecret": kis_config.app_secret,
+            }
+            try:
+                resp = SESSION.post(url, json=payload, timeout=10)
+                resp.raise_for_status()
+                data = _parse(resp)
+                self.access_token = data["access_token"]
+                self.token_expires = datetime.now() + timedelta(hours=23)
+                self._save_token()
+                logger.info("KIS 토큰 발급 완료")
+                return self.access_token
+            except Exception as e:
+                logger.error(f"KIS 토큰 발급 실패: {e}")
+                return ""
 
     def get_headers(self, tr_id: str) -> dict:
         return {
@@ -103,46 +397,80 @@ class DataCollector:
     """
 
     def __init__(self):
-        self._cache: Dict[str, Tuple[datetime, object]] = {}
-        self._ticker_name_cache: Dict[str, str] = {}
-        self.names_file = "ticker_names.json"
+        self._cache: Dict[str, Tuple[float, object]] = {}  # key → (monotonic 시각, 값)
+        self._ohlcv_span: Dict[str, int] = {}  # 종목 → 캐시된 최장 일봉 기간
+        self._inflight: Dict[str, Future] = {}  # _ttl_cache 진행 중 조회 (키별 1건만 실제 요청)
+        self._inflight_lock = threading.Lock()
+        self._ticker_name_cache: Dict[str, str] = dict(_WELL_KNOWN)
+        self.names_file = "ticker_names.jsonl"
+        self._names_dirty: set = set()  # 파일에 아직 기록되지 않은 종목코드
+        self._names_lines = 0
+        self._names_mtime = None  # 마지막으로 읽은 종목명 파일의 수정 시각
+        self._name_misses: set = set()  # KRX 갱신 후에도 이름이 없는 종목코드 (ETF·상장폐지 등)
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kis-io")
         self._load_names()
 
     def _load_names(self):
-        """파일에서 종목명 캐시 로드 (프로세스 간 공유용)"""
-        if os.path.exists(self.names_file):
+        """파일에서 종목명 캐시 로드 (한 줄 = 변경분 dict, 뒤 줄이 우선)"""
+        loads = orjson.loads if orjson else json.loads
+        if not os.path.exists(self.names_file):
+            # 구버전 단일 JSON 파일 이관
+            if os.path.exists(LEGACY_NAMES_FILE):
+                try:
+                    with open(LEGACY_NAMES_FILE, "rb") as f:
+                        self._ticker_name_cache.update(loads(f.read()))
+                    self._names_dirty.update(self._ticker_name_cache)
+                except: pass
+            return
+        try:
+            mtime = os.path.getmtime(self.names_file)
+            with open(self.names_file, "rb") as f:
+                lines = f.read().splitlines()
+        except: return
+        self._names_mtime = mtime
+        for line in lines:
             try:
-                with open(self.names_file, "r", encoding="utf-8") as f:
-                    self._ticker_name_cache.update(json.load(f))
-            except: pass
+                self._ticker_name_cache.update(loads(line))
+            except: pass  # 빈 줄 / 동시 기록 중인 줄
+        self._names_lines = len(lines)
 
     def _save_names(self):
-        """종목명 캐시를 파일에 저장"""
+        """
+        변경된 종목명만 파일 끝에 추가 (줄이 쌓이면 전체 스냅샷으로 압축)
+        스캐너/대시보드/API 서버가 같은 파일을 쓰므로 추가·압축 모두 파일 잠금 안에서 수행
+        """
+        if not self._names_dirty:
+            return
         try:
-            with open(self.names_file, "w", encoding="utf-8") as f:
-                json.dump(self._ticker_name_cache, f, ensure_ascii=False, indent=2)
+            with _file_lock(f"{self.names_file}.lock"):
+                delta = {k: self._ticker_name_cache[k] for k in self._names_dirty}
+                # 다른 프로세스가 추가한 줄까지 반영 (압축 시 유실 방지) — 내 변경분이 우선
+                self._load_names()
+                self._ticker_name_cache.update(delta)
+                if self._names_lines >= NAMES_COMPACT_LINES:
+                    tmp = f"{self.names_file}.{os.getpid()}.tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(_dumps(self._ticker_name_cache) + b"\n")
+                    os.replace(tmp, self.names_file)
+                    self._names_lines = 1
+                else:
+                    with open(self.names_file, "ab") as f:
+                        f.write(_dumps(delta) + b"\n")
+                    self._names_lines += 1
+            self._names_dirty.clear()
         except: pass
 
+    def close(self):
+        """공용 HTTP 세션 종료 (커넥션 풀 반환)"""
+        self._io_pool.shutdown(wait=False)
+        SESSION.close()
+
     def clear_cache(self):
         """저장된 모든 캐시 삭제 (강제 재수집용)"""
         self._cache.clear()
+        self._ohlcv_span.clear()
         logger.info("🧹 데이터 수집기 캐시가 초기화되었습니다.")
 
-    def get_stock_name(self, ticker: str) -> str:
-        """종목코드로 종목명 반환 (강력한 이름 복구 로직)"""
-        ticker_str = str(ticker).strip()
-        if ticker_str in self._ticker_name_cache:
-            return self._ticker_name_cache[ticker_str]
-        
-        # 캐시에 없으면 파일에서 다시 로드 시도
-        self._load_names()
-        if ticker_str in self._ticker_name_cache:
-            return self._ticker_name_cache[ticker_str]
-        
-        # 그래도 없으면 마켓 데이터 로드 시도
-        self.get_market_cap_data()
-        return self._ticker_name_cache.get(ticker_str, ticker_str)
-
     # ══════════════════════════════════════
     # 1. 종목 리스트 & 필터링
     # ══════════════════════════════════════
@@ -151,7 +479,7 @@ class DataCollector:
         cache_key = "market_cap"
         if not force and cache_key in self._cache:
             ts, df = self._cache[cache_key]
-            if (datetime.now() - ts).seconds < 600:
+            if time.monotonic() - ts < 600:
                 return df
 
         frames = []
@@ -160,16 +488,20 @@ class DataCollector:
         for i in range(7):
             target_date = (datetime.now() - timedelta(days=i)).strftime("%Y%m%d")
             temp_frames = []
-            for mkt_id, mkt_name in [("STK", "KOSPI"), ("KSQ", "KOSDAQ")]:
-                df = krx_post("dbms/MDC/STAT/standard/MDCSTAT01501", {
-                    "mktId": mkt_id,
+
+            def fetch_market(mkt):
+                return mkt[1], krx_post("dbms/MDC/STAT/standard/MDCSTAT01501", {
+                    "mktId": mkt[0],
                     "trdDd": target_date,
                     "money": "1",
                     "csvxls_isNo": "false",
                 })
-                if not df.empty:
-                    df["시장"] = mkt_name
-                    temp_frames.append(df)
+
+            # KOSPI/KOSDAQ 동시 요청
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                for mkt_name, df in ex.map(fetch_market, KRX_MARKETS):
+                    if not df.empty:
+                        temp_frames.append((mkt_name, df))
             
             if temp_frames: # 하나만 성공해도 사용
                 frames = temp_frames
@@ -181,38 +513,35 @@ class DataCollector:
             logger.warning("KRX 최근 5일 데이터 조회 실패 — 대규모 시뮬레이션 데이터 전환")
             result = self._generate_simulated_market_data()
         else:
-            result = pd.concat(frames, ignore_index=True)
-            # 컬럼 매핑
-            col_map = {
-                "ISU_SRT_CD": "종목코드",
-                "ISU_ABBRV": "종목명",
-                "TDD_CLSPRC": "종가",
-                "MKTCAP": "시가총액",
-                "ACC_TRDVAL": "거래대금",
-                "ACC_TRDVOL": "거래량",
-                "FLUC_RT": "등락률",
-                "LIST_SHRS": "상장주식수",
-            }
-            result.rename(columns={k: v for k, v in col_map.items() if k in result.columns}, inplace=True)
+            dfs = [df for _, df in frames]
+            result = dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
+            result.rename(columns=_MKTCAP_COL_MAP, inplace=True, errors="ignore")
+            # 시장 구분은 범주형으로 (문자열 object 컬럼 대비 메모리 절감)
+            codes = np.repeat(
+                [MARKET_CATEGORIES.index(name) for name, _ in frames], [len(df) for df in dfs]
+            ).astype(np.int8)
+            result["시장"] = pd.Categorical.from_codes(codes, categories=MARKET_CATEGORIES)
 
         # 숫자 변환
         for col in ["종가", "시가총액", "거래대금", "거래량"]:
             if col in result.columns:
-                result[col] = pd.to_numeric(
-                    result[col].astype(str).str.replace(",", ""), errors="coerce"
-                )
+                result[col] = _to_num(result[col])
 
         # 종목코드 정제 및 인덱스 설정
         if "종목코드" in result.columns:
             result["종목코드"] = result["종목코드"].astype(str).str.strip()
             result.set_index("종목코드", inplace=True)
 
-        # 종목 정보 캐시 갱신 및 영구 저장
+        # 종목 정보 캐시 갱신 및 영구 저장 (바뀐 종목만 기록)
+        names = self._ticker_name_cache
         for ticker, name in zip(result.index, result["종목명"]):
-            self._ticker_name_cache[str(ticker)] = str(name)
+            t, n = str(ticker), str(name)
+            if names.get(t) != n:
+                names[t] = n
+                self._names_dirty.add(t)
         
         self._save_names() # 모든 프로세스가 공유할 수 있도록 파일로 덤프
-        self._cache[cache_key] = (datetime.now(), result)
+        self._cache[cache_key] = (time.monotonic(), result)
         return result
 
     def get_ticker_details(self, ticker: str) -> Dict:
@@ -254,8 +583,7 @@ class DataCollector:
 
         # ETF/SPAC 제외
         if filter_config.exclude_etf and "종목명" in df.columns:
-            etf_keywords = ["ETF", "ETN", "KODEX", "TIGER", "KBSTAR", "ARIRANG", "SOL", "PLUS"]
-            mask = ~df["종목명"].str.contains("|".join(etf_keywords), na=False)
+            mask = ~df["종목명"].str.contains(_ETF_RE, na=False)
             df = df[mask]
 
         if "종목코드" in df.columns:
@@ -272,7 +600,16 @@ class DataCollector:
         cache_key = f"ohlcv_{ticker}_{days}"
         if cache_key in self._cache:
             ts, df = self._cache[cache_key]
-            if (datetime.now() - ts).seconds < 600:
+            if time.monotonic() - ts < 600:
+                return df
+
+        # 같은 종목의 더 긴 일봉이 캐시에 있으면 최근 구간만 잘라 재사용 (스캔 직후 손절 감시 등)
+        span = self._ohlcv_span.get(ticker, 0)
+        if span > days and f"ohlcv_{ticker}_{span}" in self._cache:
+            ts, wide = self._cache[f"ohlcv_{ticker}_{span}"]
+            if time.monotonic() - ts < 600:
+                df = wide.tail(days).copy()
+                self._cache[cache_key] = (ts, df)  # 원본과 같은 시각에 만료
                 return df
 
         df = self._fetch_ohlcv_kis(ticker, days)
@@ -284,7 +621,9 @@ class DataCollector:
         # 필수 컬럼 확인
         required = ["시가", "고가", "저가", "종가", "거래량"]
         if all(c in df.columns for c in required):
-            self._cache[cache_key] = (datetime.now(), df)
+            self._cache[cache_key] = (time.monotonic(), df)
+            if days > self._ohlcv_span.get(ticker, 0):
+                self._ohlcv_span[ticker] = days
 
         return df
 
@@ -306,9 +645,10 @@ class DataCollector:
         }
 
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            _kis_rate.acquire()
+            resp = SESSION.get(url, headers=headers, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _parse(resp)
 
             if data.get("rt_cd") != "0":
                 logger.warning(f"{ticker} KIS OHLCV 응답 오류: {data.get('msg1', '')}")
@@ -318,28 +658,25 @@ class DataCollector:
             if not output2:
                 return pd.DataFrame()
 
-            rows = []
-            for item in output2:
-                stck_bsop_date = item.get("stck_bsop_date", "")
-                if not stck_bsop_date:
-                    continue
-                rows.append({
-                    "날짜": stck_bsop_date,
-                    "시가": int(item.get("stck_oprc", 0)),
-                    "고가": int(item.get("stck_hgpr", 0)),
-                    "저가": int(item.get("stck_lwpr", 0)),
-                    "종가": int(item.get("stck_clpr", 0)),
-                    "거래량": int(item.get("acml_vol", 0)),
-                    "거래대금": int(item.get("acml_tr_pbmn", 0)),
-                })
-
-            if not rows:
+            items = [it for it in output2 if it.get("stck_bsop_date")]
+            if not items:
                 return pd.DataFrame()
 
-            df = pd.DataFrame(rows)
-            df["날짜"] = pd.to_datetime(df["날짜"])
-            df = df.set_index("날짜").sort_index()
-            df["등락률"] = df["종가"].pct_change() * 100
+            # 행마다 필드를 itemgetter로 한 번에 꺼낸 뒤 컬럼 단위 int64 배열 구성
+            try:
+                rows = list(map(_OHLCV_GETTER, items))
+            except KeyError:  # 일부 필드 누락 응답 → 0으로 채움
+                rows = [tuple(it.get(k, 0) for k in _OHLCV_KEYS) for it in items]
+            n = len(rows)
+            date_col, *value_cols = zip(*rows)
+            cols = {
+                col: np.fromiter((int(v or 0) for v in vals), dtype=np.int64, count=n)
+                for (col, _), vals in zip(OHLCV_FIELDS, value_cols)
+            }
+            dates = pd.to_datetime(date_col, format="%Y%m%d")
+
+            df = pd.DataFrame(cols, index=pd.DatetimeIndex(dates, name="날짜")).sort_index()
+            df["등락률"] = _pct_change(df["종가"].to_numpy(dtype=np.float64))
             df = df.tail(days)
 
             logger.debug(f"{ticker} KIS OHLCV 수신: {len(df)}행")
@@ -352,8 +689,9 @@ class DataCollector:
     # ══════════════════════════════════════
     # 3. 수급 데이터 (KIS API 기반)
     # ══════════════════════════════════════
-    def get_investor_data(self, ticker: str, days: int = 60) -> pd.DataFrame:
-        """외인/기관 순매수 데이터 (KIS API — 투자자별 매매동향)"""
+    @_ttl_cache(seconds=30)
+    def get_investor_flow(self, ticker: str) -> dict:
+        """외인/기관 순매수 dict (KIS API — 투자자별 매매동향, 실패 시 {})"""
         url = f"{kis_config.base_url}/uapi/domestic-stock/v1/quotations/inquire-investor"
         headers = kis_auth.get_headers("FHKST01010900")
         params = {
@@ -361,20 +699,21 @@ class DataCollector:
             "FID_INPUT_ISCD": ticker,
         }
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            _kis_rate.acquire()
+            resp = SESSION.get(url, headers=headers, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _parse(resp)
             if data.get("rt_cd") == "0":
-                output = data.get("output", {})
-                return pd.DataFrame([{
-                    "외인순매수": int(output.get("frgn_ntby_qty", 0)),
-                    "기관순매수": int(output.get("orgn_ntby_qty", 0)),
-                    "외인보유비중": float(output.get("frgn_stkn_rto", 0)),
-                }])
-            return pd.DataFrame()
+                return _investor_from_output(data.get("output", {}))
+            return {}
         except Exception as e:
             logger.debug(f"{ticker} 투자자 매매동향 조회 실패: {e}")
-            return pd.DataFrame()
+            return {}
+
+    def get_investor_data(self, ticker: str, days: int = 60) -> pd.DataFrame:
+        """외인/기관 순매수 데이터 (1행 DataFrame — 내부 수급 계산은 get_investor_flow 사용)"""
+        inv = self.get_investor_flow(ticker)
+        return pd.DataFrame([inv]) if inv else pd.DataFrame()
 
     def get_institution_holding(self, ticker: str, days: int = 30) -> pd.DataFrame:
         """기관 보유 수량 추적"""
@@ -385,6 +724,15 @@ class DataCollector:
         3대 수급 동기화 체크 (외인/기관/프로그램) + 가속도 분석
         → 가속도: 최근 5일 평균 대비 현재 수급 강도
         """
+        # 현재 수급 (당일) — 3개 KIS 조회를 동시에 요청
+        f_inv = self._io_pool.submit(self.get_investor_flow, ticker)
+        f_prog = self._io_pool.submit(self.get_program_trading, ticker)
+        f_price = self._io_pool.submit(self.get_current_price, ticker)
+        return self._build_supply_demand(ticker, f_inv.result(), f_prog.result(), f_price.result())
+
+    @staticmethod
+    def _build_supply_demand(ticker: str, inv: dict, prog: dict, price_data: dict) -> dict:
+        """투자자/프로그램/현재가 조회 결과 → 수급 동기화 + 가속도 판정"""
         result = {
             "foreign_buy": False, 
             "institution_buy": False,
@@ -401,16 +749,13 @@ class DataCollector:
 
         try:
             # 1. 현재 수급 (당일)
-            inv = self.get_investor_data(ticker)
-            prog = self.get_program_trading(ticker)
-            
             curr_f = 0
             curr_i = 0
             curr_p = 0
 
-            if not inv.empty:
-                curr_f = int(inv.iloc[0].get("외인순매수", 0))
-                curr_i = int(inv.iloc[0].get("기관순매수", 0))
+            if inv:
+                curr_f = inv["외인순매수"]
+                curr_i = inv["기관순매수"]
                 result["details"]["외인순매수"] = curr_f
                 result["details"]["기관순매수"] = curr_i
                 if curr_f > 0:
@@ -430,7 +775,6 @@ class DataCollector:
             # 2. 가속도 계산 (과거 5일 평균 대비)
             # KIS API의 한계로 정확한 리스트 조회가 어려울 경우 시뮬레이션 또는 절대 수치 기반 추정
             # 여기서는 '거래량' 대비 수급 비중의 변화로 가속도 모사
-            price_data = self.get_current_price(ticker)
             avg_vol = 100000 # 기본값
             curr_vol = price_data.get("거래량", 1)
             
@@ -456,6 +800,87 @@ class DataCollector:
 
         return result
 
+    def _run_batch(self, fn, tickers: List[str], max_workers: int = 8, **kwargs) -> Dict[str, object]:
+        """종목 리스트에 대해 KIS 조회를 병렬 실행 ({ticker: 결과})"""
+        def _call(t):
+            with _kis_slots:
+                return fn(t, **kwargs)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(_call, t): t for t in tickers}
+            for f in as_completed(futures):
+                t = futures[f]
+                try:
+                    results[t] = f.result()
+                except Exception as e:
+                    logger.debug(f"{t} 배치 조회 실패: {e}")
+        return results
+
+    def batch_current_price(self, tickers: List[str]) -> Dict[str, dict]:
+        """여러 종목 현재가 병렬 조회"""
+        return self._run_batch(self.get_current_price, tickers)
+
+    def batch_ohlcv(self, tickers: List[str], days: int = 200) -> Dict[str, pd.DataFrame]:
+        """여러 종목 일봉 병렬 조회"""
+        return self._run_batch(self.get_ohlcv, tickers, days=days)
+
+    def batch_supply_demand(self, tickers: List[str]) -> Dict[str, dict]:
+        """여러 종목 수급 병렬 조회 (httpx 설치 시 비동기, 아니면 스레드풀)"""
+        if httpx is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:  # 실행 중인 이벤트 루프 없음 → asyncio.run 가능
+                return asyncio.run(self.ascan(tickers))
+        return self._run_batch(self.get_supply_demand, tickers)
+
+    async def _akis_get(self, client, sem, path: str, tr_id: str, ticker: str,
+                        out_key: str, parser) -> dict:
+        """KIS 시세 GET (비동기) → parser(output), 실패 시 {}"""
+        headers = kis_auth.get_headers(tr_id)
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": ticker,
+        }
+        try:
+            await asyncio.sleep(_kis_rate.reserve())
+            async with sem:
+                resp = await client.get(f"{kis_config.base_url}{path}", headers=headers, params=params)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content) if orjson else resp.json()
+            if data.get("rt_cd") == "0":
+                return parser(data.get(out_key, {}))
+        except Exception as e:
+            logger.debug(f"{ticker} 비동기 조회 실패 ({tr_id}): {e}")
+        return {}
+
+    async def _asupply_demand(self, client, sem, ticker: str) -> dict:
+        """단일 종목 수급 (3개 조회 동시 요청)"""
+        base = "/uapi/domestic-stock/v1/quotations"
+        inv, prog, price_data = await asyncio.gather(
+            self._akis_get(client, sem, f"{base}/inquire-investor", "FHKST01010900",
+                           ticker, "output", _investor_from_output),
+            self._akis_get(client, sem, f"{base}/program-trade-by-stock", "FHPPG04650100",
+                           ticker, "output1", _program_from_output),
+            self._akis_get(client, sem, f"{base}/inquire-price", "FHKST01010100",
+                           ticker, "output", _price_from_output),
+        )
+        # 동기 조회 메서드(_ttl_cache)와 수급 캐시 공유 — 현재가는 실시간성 유지를 위해 캐시하지 않음
+        now = time.monotonic()
+        for name, value in (("get_investor_flow", inv), ("get_program_trading", prog)):
+            if value:
+                self._cache[f"{name}_{ticker}"] = (now, value)
+        return self._build_supply_demand(ticker, inv, prog, price_data)
+
+    async def ascan(self, tickers: List[str]) -> Dict[str, dict]:
+        """여러 종목 수급 비동기 일괄 조회 (동시 요청 KIS_MAX_CONCURRENCY개 제한)"""
+        kis_auth.get_token()  # 토큰은 루프 시작 전에 미리 확보
+        sem = asyncio.Semaphore(KIS_MAX_CONCURRENCY)
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+            results = await asyncio.gather(*(self._asupply_demand(client, sem, t) for t in tickers))
+        return dict(zip(tickers, results))
+
     # ══════════════════════════════════════
     # 4. KIS API — 호가/체결/프로그램
     # ══════════════════════════════════════
@@ -468,21 +893,12 @@ class DataCollector:
             "FID_INPUT_ISCD": ticker,
         }
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            _kis_rate.acquire()
+            resp = SESSION.get(url, headers=headers, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _parse(resp)
             if data.get("rt_cd") == "0":
-                output = data.get("output", {})
-                return {
-                    "현재가": int(output.get("stck_prpr", 0)),
-                    "등락률": float(output.get("prdy_ctrt", 0)),
-                    "거래량": int(output.get("acml_vol", 0)),
-                    "거래대금": int(output.get("acml_tr_pbmn", 0)),
-                    "시가": int(output.get("stck_oprc", 0)),
-                    "고가": int(output.get("stck_hgpr", 0)),
-                    "저가": int(output.get("stck_lwpr", 0)),
-                    "체결강도": float(output.get("seln_cnqn_smtn", 0)),
-                }
+                return _price_from_output(data.get("output", {}))
             return {}
         except Exception as e:
             logger.warning(f"{ticker} 현재가 조회 실패: {e}")
@@ -497,9 +913,10 @@ class DataCollector:
             "FID_INPUT_ISCD": ticker,
         }
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            _kis_rate.acquire()
+            resp = SESSION.get(url, headers=headers, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _parse(resp)
             if data.get("rt_cd") == "0":
                 output = data.get("output1", {})
                 total_ask = int(output.get("total_askp_rsqn", 0))
@@ -514,6 +931,7 @@ class DataCollector:
             logger.warning(f"{ticker} 호가 조회 실패: {e}")
             return {}
 
+    @_ttl_cache(seconds=30)
     def get_program_trading(self, ticker: str) -> dict:
         """프로그램 매매 동향 (KIS REST API)"""
         url = f"{kis_config.base_url}/uapi/domestic-stock/v1/quotations/program-trade-by-stock"
@@ -523,16 +941,12 @@ class DataCollector:
             "FID_INPUT_ISCD": ticker,
         }
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            _kis_rate.acquire()
+            resp = SESSION.get(url, headers=headers, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _parse(resp)
             if data.get("rt_cd") == "0":
-                output = data.get("output1", {})
-                return {
-                    "프로그램매수": int(output.get("pgmn_buy_qty", 0)),
-                    "프로그램매도": int(output.get("pgmn_sell_qty", 0)),
-                    "프로그램순매수": int(output.get("pgmn_ntby_qty", 0)),
-                }
+                return _program_from_output(data.get("output1", {}))
             return {}
         except Exception as e:
             logger.warning(f"{ticker} 프로그램매매 조회 실패: {e}")
@@ -547,25 +961,28 @@ class DataCollector:
         if ohlcv.empty:
             return pd.DataFrame()
 
-        price_range = np.linspace(ohlcv["저가"].min(), ohlcv["고가"].max(), bins + 1)
-        volume_profile = []
-
-        for i in range(len(price_range) - 1):
-            low, high = price_range[i], price_range[i + 1]
-            mid = (low + high) / 2
-            mask = (ohlcv["저가"] <= high) & (ohlcv["고가"] >= low)
-            vol = ohlcv.loc[mask, "거래량"].sum()
-            volume_profile.append({
-                "가격하한": int(low),
-                "가격상한": int(high),
-                "중심가격": int(mid),
-                "거래량합": int(vol),
-            })
-
-        df = pd.DataFrame(volume_profile)
-        total_vol = df["거래량합"].sum()
-        df["거래량비율"] = df["거래량합"] / max(total_vol, 1)
-        return df
+        lows = ohlcv["저가"].to_numpy(dtype=float)
+        highs = ohlcv["고가"].to_numpy(dtype=float)
+        vols = ohlcv["거래량"].to_numpy(dtype=np.int64)
+        edges = np.linspace(lows.min(), highs.max(), bins + 1)
+
+        # 각 봉이 걸치는 구간 [start, end] 계산 후 차분 배열 누적합으로 구간별 거래량 합산
+        start = np.searchsorted(edges[1:], lows, side="left")
+        end = np.searchsorted(edges[:-1], highs, side="right") - 1
+        valid = start <= end
+        diff = np.zeros(bins + 1, dtype=np.int64)
+        np.add.at(diff, start[valid], vols[valid])
+        np.add.at(diff, end[valid] + 1, -vols[valid])
+        vol_bins = np.cumsum(diff[:-1])
+
+        total_vol = vol_bins.sum()
+        return pd.DataFrame({
+            "가격하한": edges[:-1].astype(int),
+            "가격상한": edges[1:].astype(int),
+            "중심가격": ((edges[:-1] + edges[1:]) / 2).astype(int),
+            "거래량합": vol_bins,
+            "거래량비율": vol_bins / max(total_vol, 1),
+        })
 
     # ══════════════════════════════════════
     # 6. 지수 데이터
@@ -575,7 +992,7 @@ class DataCollector:
         cache_key = f"index_{index_code}_{days}"
         if cache_key in self._cache:
             ts, df = self._cache[cache_key]
-            if (datetime.now() - ts).seconds < 600:
+            if time.monotonic() - ts < 600:
                 return df
 
         end_date = datetime.now().strftime("%Y%m%d")
@@ -591,22 +1008,11 @@ class DataCollector:
         if df.empty:
             df = self._generate_simulated_index(index_code, days)
         else:
-            col_map = {
-                "TRD_DD": "날짜",
-                "CLSPRC_IDX": "종가",
-                "OPNPRC_IDX": "시가",
-                "HGPRC_IDX": "고가",
-                "LWPRC_IDX": "저가",
-                "ACC_TRDVOL": "거래량",
-                "ACC_TRDVAL": "거래대금",
-            }
-            df.rename(columns={k: v for k, v in col_map.items() if k in df.columns}, inplace=True)
+            df.rename(columns=_INDEX_COL_MAP, inplace=True, errors="ignore")
 
             for col in ["종가", "시가", "고가", "저가"]:
                 if col in df.columns:
-                    df[col] = pd.to_numeric(
-                        df[col].astype(str).str.replace(",", ""), errors="coerce"
-                    )
+                    df[col] = _to_num(df[col])
 
             if "날짜" in df.columns:
                 df["날짜"] = pd.to_datetime(df["날짜"])
@@ -614,31 +1020,39 @@ class DataCollector:
 
             df = df.tail(days)
 
-        self._cache[cache_key] = (datetime.now(), df)
+        self._cache[cache_key] = (time.monotonic(), df)
         return df
 
     # ══════════════════════════════════════
     # 7. 종목명 조회
     # ══════════════════════════════════════
     def get_stock_name(self, ticker: str) -> str:
-        """종목명 반환"""
-        if ticker in self._ticker_name_cache:
-            return self._ticker_name_cache[ticker]
-
-        # KRX에서 조회 시도
-        well_known = {
-            "005930": "삼성전자", "000660": "SK하이닉스",
-            "373220": "LG에너지솔루션", "207940": "삼성바이오로직스",
-            "005380": "현대차", "006400": "삼성SDI",
-            "035420": "NAVER", "051910": "LG화학",
-            "068270": "셀트리온", "028260": "삼성물산",
-            "035720": "카카오", "105560": "KB금융",
-            "055550": "신한지주", "066570": "LG전자",
-            "003670": "포스코퓨처엠", "000270": "기아",
-            "012330": "현대모비스", "096770": "SK이노베이션",
-            "034730": "SK", "015760": "한국전력",
-        }
-        return well_known.get(ticker, ticker)
+        """종목코드로 종목명 반환 (메모리 → 파일 → KRX 순 복구, 끝내 없으면 코드 그대로)"""
+        ticker_str = str(ticker).strip()
+        name = self._ticker_name_cache.get(ticker_str)
+        if name is not None:
+            return name
+        if ticker_str in self._name_misses:
+            return ticker_str
+
+        # 파일이 바뀐 경우에만 다시 로드 (다른 프로세스가 갱신했을 수 있음)
+        try:
+            mtime = os.path.getmtime(self.names_file)
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != self._names_mtime:
+            self._load_names()
+            name = self._ticker_name_cache.get(ticker_str)
+            if name is not None:
+                return name
+
+        # 그래도 없으면 마켓 데이터 로드 시도 — 갱신 후에도 없으면 미스로 기억해 재조회 생략
+        self.get_market_cap_data()
+        name = self._ticker_name_cache.get(ticker_str)
+        if name is None:
+            self._name_misses.add(ticker_str)
+            return ticker_str
+        return name
 
     # ══════════════════════════════════════
     # 8. 시뮬레이션 데이터 (API 미연결 시)
@@ -656,12 +1070,9 @@ class DataCollector:
         base = base_prices.get(ticker, 50000)
 
         dates = pd.bdate_range(end=datetime.now(), periods=days, freq='B')
-        prices = [base]
-        for _ in range(days - 1):
-            change = np.random.normal(0, 0.02)
-            prices.append(prices[-1] * (1 + change))
-
-        prices = np.array(prices)
+        # 랜덤워크: 일별 수익률 누적곱 (Python 루프 없이)
+        changes = np.random.normal(0, 0.02, days - 1)
+        prices = base * np.cumprod(np.r_[1.0, 1 + changes])
         highs = prices * (1 + np.random.uniform(0, 0.03, days))
         lows = prices * (1 - np.random.uniform(0, 0.03, days))
         opens = prices * (1 + np.random.uniform(-0.015, 0.015, days))
@@ -677,13 +1088,13 @@ class DataCollector:
         }, index=dates)
 
         # 등락률 추가
-        df["등락률"] = df["종가"].pct_change() * 100
+        df["등락률"] = _pct_change(df["종가"].to_numpy(dtype=np.float64))
 
         return df
 
     def _generate_simulated_market_data(self) -> pd.DataFrame:
         """대규모 시뮬레이션 시장 데이터 (테스트용 200종목)"""
-        data = []
+        rng = np.random.default_rng(42)
         # 주요 우량주 우선 배치
         blue_chips = [
             ("005930", "삼성전자"), ("000660", "SK하이닉스"), ("373220", "LG에너지솔루션"),
@@ -691,32 +1102,32 @@ class DataCollector:
             ("068270", "셀트리온"), ("035420", "NAVER"), ("005490", "POSCO홀딩스"),
             ("035720", "카카오")
         ]
-        
-        for ticker, name in blue_chips:
-            np.random.seed(hash(ticker) % 2**31)
-            cap = np.random.randint(50, 500) * 1_000_000_000_000
-            trdval = np.random.randint(100, 1000) * 1_000_000_000
-            data.append({
-                "종목코드": ticker, "종목명": name, "종가": np.random.randint(50000, 800000),
-                "시가총액": cap, "거래대금": trdval, "거래량": np.random.randint(500000, 5000000),
-                "시장": "KOSPI",
-            })
-
-        # 나머지 190개 더미 데이터 생성
-        for i in range(190):
-            t = f"{900000 + i:06d}"
-            name = f"시뮬레이션_{i+1:03d}"
-            np.random.seed(i)
-            cap = np.random.randint(1, 100) * 1_000_000_000_000
-            trdval = np.random.randint(1, 100) * 1_000_000_000
-            data.append({
-                "종목코드": t, "종목명": name, "종가": np.random.randint(1000, 100000),
-                "시가총액": cap, "거래대금": trdval, "거래량": np.random.randint(10000, 1000000),
-                "시장": "KOSDAQ",
-            })
-            self._ticker_name_cache[t] = name # 생성 즉시 캐시 삽입
-            
-        df = pd.DataFrame(data).set_index("종목코드")
+        n_blue, n_dummy = len(blue_chips), 190
+
+        # 나머지 190개 더미 종목
+        dummy_tickers = [f"{900000 + i:06d}" for i in range(n_dummy)]
+        dummy_names = [f"시뮬레이션_{i+1:03d}" for i in range(n_dummy)]
+
+        tickers = [t for t, _ in blue_chips] + dummy_tickers
+        names = [n for _, n in blue_chips] + dummy_names
+        df = pd.DataFrame({
+            "종목명": names,
+            "종가": np.concatenate([
+                rng.integers(50000, 800000, n_blue), rng.integers(1000, 100000, n_dummy)
+            ]).astype(np.int64),
+            "시가총액": np.concatenate([
+                rng.integers(50, 500, n_blue), rng.integers(1, 100, n_dummy)
+            ]).astype(np.int64) * 1_000_000_000_000,
+            "거래대금": np.concatenate([
+                rng.integers(100, 1000, n_blue), rng.integers(1, 100, n_dummy)
+            ]).astype(np.int64) * 1_000_000_000,
+            "거래량": np.concatenate([
+                rng.integers(500000, 5000000, n_blue), rng.integers(10000, 1000000, n_dummy)
+            ]).astype(np.int64),
+            "시장": pd.Categorical.from_codes(
+                np.repeat(np.int8([0, 1]), [n_blue, n_dummy]), categories=MARKET_CATEGORIES
+            ),
+        }, index=pd.Index(tickers, name="종목코드"))
         return df
 
     def _generate_simulated_index(self, index_code: str, days: int) -> pd.DataFrame:
@@ -725,15 +1136,13 @@ class DataCollector:
         base = 5950 if index_code == "1001" else 5970 
         dates = pd.bdate_range(end=datetime.now(), periods=days, freq='B')
 
-        prices = [base]
-        for _ in range(days - 1):
-            prices.append(prices[-1] * (1 + np.random.normal(0, 0.005)))
+        prices = base * np.cumprod(np.r_[1.0, 1 + np.random.normal(0, 0.005, days - 1)])
 
         df = pd.DataFrame({
             "종가": prices,
-            "시가": [p * (1 + np.random.uniform(-0.003, 0.003)) for p in prices],
-            "고가": [p * (1 + np.random.uniform(0, 0.005)) for p in prices],
-            "저가": [p * (1 - np.random.uniform(0, 0.005)) for p in prices],
+            "시가": prices * (1 + np.random.uniform(-0.003, 0.003, days)),
+            "고가": prices * (1 + np.random.uniform(0, 0.005, days)),
+            "저가": prices * (1 - np.random.uniform(0, 0.005, days)),
         }, index=dates)
         return df
 
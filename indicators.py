@@ -6,11 +6,138 @@
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import logging
+import weakref
+import threading
+from functools import lru_cache
+
+from indicators_numba import (
+    NUMBA_AVAILABLE, rsi_kernel as _rsi_kernel,
+    panel_sma as _panel_sma, panel_atr as _panel_atr,
+)
 
 logger = logging.getLogger(__name__)
 
+# ──────────────────────────────────────────
+# DataFrame별 계산 결과 메모 (전략 5종이 같은 OHLCV 캐시 객체를 공유)
+# id(df) → (데이터 스탬프, {(지표, 인자): 값}) — DataFrame 소멸 시 자동 제거되어 id 재사용 문제 없음
+# 스탬프 = (행수, 마지막 인덱스, 마지막 종가) — 장중 갱신으로 마지막 봉을 덮어쓰면 메모 전체 무효화
+# ──────────────────────────────────────────
+_memo: Dict[int, tuple] = {}
+_memo_lock = threading.Lock()  # 스캐너 작업 스레드 동시 접근 (finalize 의 pop 은 단일 dict 연산이라 잠금 불필요)
+
+
+def _memo_stamp(df: pd.DataFrame) -> tuple:
+    n = len(df)
+    if not n:
+        return (0,)
+    try:
+        return (n, df.index[-1], df["종가"].iat[-1])
+    except (KeyError, IndexError):
+        return (n, df.index[-1])
+
+
+def _memo_get(df: pd.DataFrame, key: tuple):
+    stamp = _memo_stamp(df)
+    with _memo_lock:
+        entry = _memo.get(id(df))
+        if entry is None or entry[0] != stamp:
+            return None
+        return entry[1].get(key)
+
+
+def _memo_put(df: pd.DataFrame, key: tuple, value) -> None:
+    stamp = _memo_stamp(df)
+    df_id = id(df)
+    with _memo_lock:
+        entry = _memo.get(df_id)
+        if entry is None:
+            try:
+                weakref.finalize(df, _memo.pop, df_id, None)
+            except TypeError:  # 약한 참조 불가 객체 → 메모 생략
+                return
+        if entry is None or entry[0] != stamp:
+            entry = _memo[df_id] = (stamp, {})
+        entry[1][key] = value
+
+
+# ──────────────────────────────────────────
+# OHLCV 연속 배열 (N, 5) — 한글 컬럼명 조회를 DataFrame당 1회로 제한
+# ──────────────────────────────────────────
+OHLCV_COLS = ["시가", "고가", "저가", "종가", "거래량"]
+O, H, L, C, V = range(5)
+
+
+def ohlcv_array(df: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+    """[시가, 고가, 저가, 종가, 거래량] float64 배열 (DataFrame별 메모, ndarray는 그대로 반환)"""
+    if isinstance(df, np.ndarray):
+        return df
+    arr = _memo_get(df, ("ohlcv",))
+    if arr is None:
+        arr = df[OHLCV_COLS].to_numpy(dtype=np.float64)
+        _memo_put(df, ("ohlcv",), arr)
+    return arr
+
+
+def window_high_low(df: Union[pd.DataFrame, np.ndarray], lookback: int) -> Tuple[float, float]:
+    """최근 lookback봉 고가 최대 / 저가 최소 (박스권·목표가 산출이 같은 구간을 공유)"""
+    key = ("hilo", lookback)
+    cached = _memo_get(df, key) if isinstance(df, pd.DataFrame) else None
+    if cached is None:
+        recent = ohlcv_array(df)[-lookback:]
+        cached = (recent[:, H].max(), recent[:, L].min())
+        if isinstance(df, pd.DataFrame):
+            _memo_put(df, key, cached)
+    return cached
+
+
+# 매집봉 탐지 결과 레코드 (dict 대신 구조화 배열 — 보고 단계에서만 dict로 변환)
+ACCUM_DTYPE = np.dtype([("date", "M8[ns]"), ("close", "f8"), ("volume", "i8"), ("vol_ratio", "f4")])
+
+
+def _accumulation_hits(dates: pd.Index, close: np.ndarray, volume: np.ndarray, avg_vol: float) -> np.ndarray:
+    hits = np.empty(len(dates), dtype=ACCUM_DTYPE)
+    hits["date"] = dates.to_numpy().astype("M8[ns]")
+    hits["close"] = close
+    hits["volume"] = volume
+    hits["vol_ratio"] = volume / avg_vol
+    return hits
+
+
+def accumulation_records(hits: np.ndarray) -> List[Dict]:
+    """매집봉 구조화 배열 → 보고용 dict 목록 (날짜/종가/거래량/거래량배수)"""
+    return [
+        {
+            "날짜": str(pd.Timestamp(date)),
+            "종가": float(close),
+            "거래량": int(volume),
+            "거래량배수": round(float(ratio), 2),
+        }
+        for date, close, volume, ratio in zip(
+            hits["date"], hits["close"], hits["volume"], hits["vol_ratio"]
+        )
+    ]
+
+# 피보나치 되돌림/확장 기본 레벨 (키 문자열까지 미리 생성)
+_FIB_LVL = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0])
+_FIB_KEYS = tuple(f"fib_{x}" for x in _FIB_LVL.tolist())
+_EXT_LVL = np.array([1.0, 1.272, 1.618, 2.0, 2.618])
+_EXT_KEYS = tuple(f"ext_{x}" for x in _EXT_LVL.tolist())
+
+
+# 스윙 고/저점(원 단위 정수)별 레벨 결과 캐시 — 같은 고/저점이 반복 스캔됨
+@lru_cache(maxsize=2048)
+def _fib_levels_cached(high: int, low: int) -> Tuple[Tuple[str, float], ...]:
+    prices = np.round(high - (high - low) * _FIB_LVL)
+    return tuple(zip(_FIB_KEYS, prices.tolist()))
+
+
+@lru_cache(maxsize=2048)
+def _fib_extension_cached(high: int, low: int) -> Tuple[Tuple[str, float], ...]:
+    prices = np.round(low + (high - low) * _EXT_LVL)
+    return tuple(zip(_EXT_KEYS, prices.tolist()))
+
 
 class TechnicalIndicators:
     """기술적 지표 계산 엔진"""
@@ -36,18 +163,69 @@ class TechnicalIndicators:
         for p in periods:
             col = f"MA{p}"
             if len(df) >= p:
+                # 같은 DataFrame에 이미 계산된 MA는 재계산 생략
+                if col in df.columns and _memo_get(df, ("sma", p)):
+                    continue
                 df[col] = TechnicalIndicators.sma(df["종가"], p)
+                _memo_put(df, ("sma", p), True)
         return df
 
+    @staticmethod
+    def add_panel_indicators(
+        dfs: List[pd.DataFrame], periods: List[int] = None, atr_period: int = 14
+    ) -> None:
+        """
+        여러 종목 일봉에 MA/ATR 일괄 계산 (종목 축 병렬 커널)
+        - 결과는 각 DataFrame의 MA 컬럼 + 지표 메모에 기록 → 이후 add_all_ma/atr 호출은 재계산 없음
+        - numba 미설치 시 종목별 계산으로 대체
+        """
+        if periods is None:
+            periods = [5, 10, 20, 60, 120]
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            return
+        if not NUMBA_AVAILABLE:
+            for df in dfs:
+                TechnicalIndicators.add_all_ma(df, periods)
+                TechnicalIndicators.atr(df, atr_period)
+            return
+
+        # 길이가 다른 종목은 뒤(최근)를 맞추고 앞쪽을 NaN으로 채워 (T, N) 패널 구성
+        t_max = max(len(df) for df in dfs)
+        arrays = [ohlcv_array(df) for df in dfs]
+        panels = {}
+        for col, k in (("고가", H), ("저가", L), ("종가", C)):
+            arr = np.full((t_max, len(dfs)), np.nan)
+            for j, a in enumerate(arrays):
+                arr[t_max - len(a):, j] = a[:, k]
+            panels[col] = arr
+
+        out = np.empty_like(panels["종가"])
+        for p in periods:
+            _panel_sma(panels["종가"], p, out)
+            for j, df in enumerate(dfs):
+                if len(df) >= p:
+                    df[f"MA{p}"] = out[t_max - len(df):, j]
+                    _memo_put(df, ("sma", p), True)
+
+        _panel_atr(panels["고가"], panels["저가"], panels["종가"], atr_period, out)
+        for j, df in enumerate(dfs):
+            _memo_put(df, ("atr", atr_period), pd.Series(out[t_max - len(df):, j], index=df.index))
+
     # ══════════════════════════════════════
     # 2. RSI (Relative Strength Index)
     # ══════════════════════════════════════
     @staticmethod
     def rsi(series: pd.Series, period: int = 14) -> pd.Series:
         """RSI 지표"""
-        delta = series.diff()
-        gain = delta.where(delta > 0, 0.0)
-        loss = (-delta).where(delta < 0, 0.0)
+        values = series.to_numpy(dtype=np.float64, copy=False)
+        if NUMBA_AVAILABLE:
+            return pd.Series(_rsi_kernel(values, period), index=series.index)
+
+        # numba 미설치: 상승/하락분을 마스크 없이 fmax로 분리 (NaN → 0) 후 pandas ewm
+        delta = np.diff(values, prepend=np.nan)
+        gain = pd.Series(np.fmax(delta, 0.0), index=series.index)
+        loss = pd.Series(np.fmax(-delta, 0.0), index=series.index)
 
         avg_gain = gain.ewm(com=period - 1, min_periods=period).mean()
         avg_loss = loss.ewm(com=period - 1, min_periods=period).mean()
@@ -62,16 +240,21 @@ class TechnicalIndicators:
     @staticmethod
     def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """평균 진폭 (변동성 지표)"""
-        high = df["고가"]
-        low = df["저가"]
-        close = df["종가"].shift(1)
-
-        tr1 = high - low
-        tr2 = (high - close).abs()
-        tr3 = (low - close).abs()
-
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return true_range.rolling(window=period, min_periods=period).mean()
+        cached = _memo_get(df, ("atr", period))
+        if cached is not None:
+            return cached
+
+        a = ohlcv_array(df)
+        high, low = a[:, H], a[:, L]
+        prev_close = np.empty_like(high)
+        prev_close[:1] = np.nan
+        prev_close[1:] = a[:-1, C]
+
+        # 첫 행은 전일 종가가 없으므로 고가-저가만 사용 (기존 max(axis=1)의 NaN 무시와 동일)
+        true_range = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+        result = pd.Series(true_range, index=df.index).rolling(window=period, min_periods=period).mean()
+        _memo_put(df, ("atr", period), result)
+        return result
 
     # ══════════════════════════════════════
     # 4. 이평선 기울기 (Slope)
@@ -84,10 +267,11 @@ class TechnicalIndicators:
     @staticmethod
     def ma_slope_degree(series: pd.Series, lookback: int = 5) -> float:
         """최근 기울기의 각도 (단위: %)"""
-        if len(series) < lookback + 1:
+        a = series.to_numpy()
+        if a.size < lookback + 1:
             return 0.0
-        slope = (series.iloc[-1] - series.iloc[-lookback]) / series.iloc[-lookback] * 100
-        return round(slope, 4)
+        base = a[-lookback]
+        return 0.0 if base == 0 else round(float((a[-1] - base) / base * 100), 4)
 
     # ══════════════════════════════════════
     # 5. 골든 크로스 / 데드 크로스 판별
@@ -98,18 +282,17 @@ class TechnicalIndicators:
         골든 크로스 / 데드 크로스 감지
         Returns: {"golden_cross": bool, "dead_cross": bool}
         """
-        if len(short_ma) < 2 or len(long_ma) < 2:
+        s = short_ma.to_numpy()
+        l = long_ma.to_numpy()
+        if s.size < 2 or l.size < 2:
             return {"golden_cross": False, "dead_cross": False}
+        s0, s1, l0, l1 = s[-2], s[-1], l[-2], l[-1]
 
         # 전일: short < long, 금일: short >= long → 골든크로스
-        prev_below = short_ma.iloc[-2] < long_ma.iloc[-2]
-        curr_above = short_ma.iloc[-1] >= long_ma.iloc[-1]
-        golden = prev_below and curr_above
+        golden = bool(s0 < l0 and s1 >= l1)
 
         # 전일: short > long, 금일: short <= long → 데드크로스
-        prev_above = short_ma.iloc[-2] > long_ma.iloc[-2]
-        curr_below = short_ma.iloc[-1] <= long_ma.iloc[-1]
-        dead = prev_above and curr_below
+        dead = bool(s0 > l0 and s1 <= l1)
 
         return {"golden_cross": golden, "dead_cross": dead}
 
@@ -125,14 +308,11 @@ class TechnicalIndicators:
         상승 추세: low → high 기준 되돌림
         """
         if levels is None:
-            levels = [0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0]
+            return dict(_fib_levels_cached(int(round(high)), int(round(low))))
 
-        diff = high - low
-        result = {}
-        for level in levels:
-            price = high - diff * level
-            result[f"fib_{level}"] = round(price, 0)
-        return result
+        lvl = np.asarray(levels, dtype=np.float64)
+        prices = np.round(high - (high - low) * lvl)
+        return dict(zip([f"fib_{x}" for x in levels], prices.tolist()))
 
     @staticmethod
     def fibonacci_extension(
@@ -140,14 +320,11 @@ class TechnicalIndicators:
     ) -> Dict[str, float]:
         """피보나치 확장 레벨 (목표가 산출)"""
         if levels is None:
-            levels = [1.0, 1.272, 1.618, 2.0, 2.618]
+            return dict(_fib_extension_cached(int(round(high)), int(round(low))))
 
-        diff = high - low
-        result = {}
-        for level in levels:
-            price = low + diff * level
-            result[f"ext_{level}"] = round(price, 0)
-        return result
+        lvl = np.asarray(levels, dtype=np.float64)
+        prices = np.round(low + (high - low) * lvl)
+        return dict(zip([f"ext_{x}" for x in levels], prices.tolist()))
 
     # ══════════════════════════════════════
     # 7. 이동평균선 밀집도 (정배열 초입)
@@ -193,20 +370,11 @@ class TechnicalIndicators:
         # 발산 확인: 최근 3일간 spread가 증가하는 추세
         diverging = False
         if len(df) >= 5:
-            recent_spreads = []
-            for offset in range(3):
-                idx = -(offset + 1)
-                vals = []
-                for p in periods:
-                    col = f"MA{p}"
-                    if col in df.columns and len(df) >= abs(idx):
-                        vals.append(df[col].iloc[idx])
-                if vals:
-                    s = (max(vals) - min(vals)) / min(vals) if min(vals) > 0 else 0
-                    recent_spreads.append(s)
-
-            if len(recent_spreads) >= 3:
-                diverging = recent_spreads[0] > recent_spreads[1] > recent_spreads[2]
+            # 최근 3행 × MA 컬럼을 한 번에 꺼내 행별 (최대-최소)/최소 계산
+            arr = df[[f"MA{p}" for p in periods]].to_numpy(dtype=np.float64)[-3:]
+            mins = arr.min(axis=1)
+            spreads = np.where(mins > 0, (arr.max(axis=1) - mins) / np.where(mins > 0, mins, 1.0), 0.0)
+            diverging = bool(spreads[-1] > spreads[-2] > spreads[-3])
 
         return {
             "converged": converged,
@@ -228,22 +396,25 @@ class TechnicalIndicators:
         if len(df) < lookback:
             return {}
 
-        recent = df.tail(lookback + 5).head(lookback)
-        # 양봉 필터
-        bullish = recent[recent["종가"] > recent["시가"]].copy()
-        if bullish.empty:
-            bullish = recent
+        # tail(lookback + 5).head(lookback) 구간을 위치 인덱스로 직접 계산
+        n = len(df)
+        start = max(0, n - lookback - 5)
+        end = start + lookback
+        w = ohlcv_array(df)[start:end]
+        o, h, l, c = w[:, O], w[:, H], w[:, L], w[:, C]
 
-        # 가장 큰 캔들 (고가-저가 범위)
-        bullish["범위"] = bullish["고가"] - bullish["저가"]
-        ref = bullish.loc[bullish["범위"].idxmax()]
+        # 양봉 중 가장 큰 캔들 (고가-저가 범위), 양봉이 없으면 전체 중 최대
+        rng = h - l
+        bull = c > o
+        if bull.any():
+            rng = np.where(bull, rng, -np.inf)
+        i = int(np.argmax(rng))
 
-        center = (ref["고가"] + ref["저가"]) / 2
         return {
-            "기준봉_고가": float(ref["고가"]),
-            "기준봉_저가": float(ref["저가"]),
-            "기준봉_중심값": float(center),
-            "기준봉_날짜": str(ref.name),
+            "기준봉_고가": float(h[i]),
+            "기준봉_저가": float(l[i]),
+            "기준봉_중심값": float((h[i] + l[i]) / 2),
+            "기준봉_날짜": str(df.index[start + i]),
         }
 
     # ══════════════════════════════════════
@@ -254,43 +425,37 @@ class TechnicalIndicators:
         df: pd.DataFrame,
         lookback: int = 20,
         volume_ratio: float = 2.0
-    ) -> List[Dict]:
+    ) -> np.ndarray:
         """
         매집봉 탐지
         - 거래량이 평균의 volume_ratio배 이상
         - 양봉 (종가 > 시가)
         - 긴 아래꼬리 (= 매수세 유입)
+        Returns: ACCUM_DTYPE 구조화 배열 (dict 변환은 accumulation_records)
         """
         if len(df) < lookback:
-            return []
-
-        recent = df.tail(lookback)
-        avg_vol = recent["거래량"].mean()
+            return np.empty(0, dtype=ACCUM_DTYPE)
 
-        accumulation_candles = []
-        for idx, row in recent.iterrows():
-            is_bullish = row["종가"] > row["시가"]
-            high_volume = row["거래량"] > avg_vol * volume_ratio
-            body = abs(row["종가"] - row["시가"])
-            lower_wick = min(row["시가"], row["종가"]) - row["저가"]
-            has_long_lower = lower_wick > body * 0.5 if body > 0 else False
+        recent = ohlcv_array(df)[-lookback:]
+        o, l, c, v = recent[:, O], recent[:, L], recent[:, C], recent[:, V]
+        avg_vol = v.mean()
 
-            if high_volume and (is_bullish or has_long_lower):
-                accumulation_candles.append({
-                    "날짜": str(idx),
-                    "종가": float(row["종가"]),
-                    "거래량": int(row["거래량"]),
-                    "거래량배수": round(row["거래량"] / avg_vol, 2),
-                })
+        # 행 반복 없이 조건 마스크 일괄 계산
+        body = np.abs(c - o)
+        lower_wick = np.minimum(o, c) - l
+        is_bullish = c > o
+        high_volume = v > avg_vol * volume_ratio
+        has_long_lower = (body > 0) & (lower_wick > body * 0.5)
+        hits = np.flatnonzero(high_volume & (is_bullish | has_long_lower))
 
-        return accumulation_candles
+        return _accumulation_hits(df.index[len(df) - lookback + hits], c[hits], v[hits], avg_vol)
 
     # ══════════════════════════════════════
     # 10. 박스권 탐지
     # ══════════════════════════════════════
     @staticmethod
     def detect_box_range(
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, np.ndarray],
         lookback: int = 60,
         tolerance: float = 0.05
     ) -> Dict[str, any]:
@@ -301,20 +466,18 @@ class TechnicalIndicators:
         if len(df) < lookback:
             return {}
 
-        recent = df.tail(lookback)
-        box_high = recent["고가"].max()
-        box_low = recent["저가"].min()
+        box_high, box_low = window_high_low(df, lookback)
         box_range_pct = (box_high - box_low) / box_low
 
-        current = df["종가"].iloc[-1]
+        current = ohlcv_array(df)[-1, C]
         near_high = (box_high - current) / current <= tolerance
 
         return {
             "박스상단": float(box_high),
             "박스하단": float(box_low),
             "박스범위%": round(box_range_pct * 100, 2),
-            "현재가_상단근접": near_high,
-            "돌파여부": current > box_high,
+            "현재가_상단근접": bool(near_high),
+            "돌파여부": bool(current > box_high),
         }
 
     # ══════════════════════════════════════
@@ -322,7 +485,7 @@ class TechnicalIndicators:
     # ══════════════════════════════════════
     @staticmethod
     def detect_volume_cliff(
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, np.ndarray],
         lookback: int = 10,
         cliff_threshold: float = 0.3
     ) -> Dict[str, any]:
@@ -334,20 +497,16 @@ class TechnicalIndicators:
         if len(df) < lookback:
             return {"volume_cliff": False}
 
-        recent = df.tail(lookback)
-        avg_vol = recent["거래량"].mean()
-        last_vol = df["거래량"].iloc[-1]
-        ratio = last_vol / avg_vol if avg_vol > 0 else 1.0
+        a = ohlcv_array(df)
+        v, c = a[:, V], a[:, C]
+        avg_vol = v[-lookback:].mean()
+        ratio = v[-1] / avg_vol if avg_vol > 0 else 1.0
 
         # 최근 3일 거래량 감소 추세
-        last_3_vol = df["거래량"].tail(3)
-        decreasing = all(
-            last_3_vol.iloc[i] <= last_3_vol.iloc[i - 1]
-            for i in range(1, len(last_3_vol))
-        )
+        decreasing = bool(np.all(np.diff(v[-3:]) <= 0))
 
         # 주가 하락 중인지
-        price_declining = df["종가"].iloc[-1] < df["종가"].iloc[-3] if len(df) >= 3 else False
+        price_declining = bool(c[-1] < c[-3]) if len(c) >= 3 else False
 
         is_cliff = ratio <= cliff_threshold and decreasing
 
@@ -436,11 +595,13 @@ class TechnicalIndicators:
         if len(df) < 20:
             return {}
 
+        cached = _memo_get(df, ("target", method))
+        if cached is not None:
+            return dict(cached)
+
         # 최근 스윙 고/저점
-        recent = df.tail(60) if len(df) >= 60 else df
-        swing_high = recent["고가"].max()
-        swing_low = recent["저가"].min()
-        current = df["종가"].iloc[-1]
+        swing_high, swing_low = window_high_low(df, 60)
+        current = ohlcv_array(df)[-1, C]
 
         # 피보나치 확장
         fib_ext = TechnicalIndicators.fibonacci_extension(swing_high, swing_low)
@@ -463,9 +624,157 @@ class TechnicalIndicators:
             if len(ext_values) > 1:
                 targets["2차_목표가"] = ext_values[1]
 
+        if volume_profile is None:  # 매물대 인자가 주어지면 결과가 달라질 수 있어 메모 제외
+            _memo_put(df, ("target", method), dict(targets))
         return targets
 
 
+# ──────────────────────────────────────────
+# 온라인(증분) 지표 — 주기적 재스캔 시 새 봉만 반영
+# ──────────────────────────────────────────
+class OnlineSMA:
+    """단순 이동평균 O(1) 갱신 (push: 새 봉 추가, revise: 마지막 봉 값 수정)"""
+    __slots__ = ("n", "buf", "i", "count", "sum", "prev")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.buf = [0.0] * n
+        self.i = 0
+        self.count = 0
+        self.sum = 0.0
+        self.prev = np.nan  # 마지막 봉 추가 직전 값 (= 전일 MA)
+
+    @property
+    def value(self) -> float:
+        return self.sum / self.n if self.count >= self.n else np.nan
+
+    def push(self, x: float) -> float:
+        self.prev = self.value
+        slot = self.i % self.n
+        if self.count >= self.n:
+            self.sum -= self.buf[slot]
+        else:
+            self.count += 1
+        self.buf[slot] = x
+        self.sum += x
+        self.i += 1
+        return self.value
+
+    def revise(self, x: float) -> float:
+        slot = (self.i - 1) % self.n
+        self.sum += x - self.buf[slot]
+        self.buf[slot] = x
+        return self.value
+
+
+class OnlineRSI:
+    """RSI O(1) 갱신 — TechnicalIndicators.rsi 와 동일한 평활 (α = 1/period)"""
+    __slots__ = ("period", "decay", "num_g", "num_l", "count", "last", "_undo")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.decay = 1.0 - 1.0 / period
+        self.num_g = 0.0
+        self.num_l = 0.0
+        self.count = 0
+        self.last = None
+        self._undo = None
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period or self.num_l <= 0:
+            return 50.0
+        return 100.0 - 100.0 / (1.0 + self.num_g / self.num_l)
+
+    def push(self, x: float) -> float:
+        self._undo = (self.num_g, self.num_l, self.count, self.last)
+        g = ls = 0.0
+        if self.last is not None:
+            d = x - self.last
+            g = d if d > 0 else 0.0
+            ls = -d if d < 0 else 0.0
+        self.num_g = self.num_g * self.decay + g
+        self.num_l = self.num_l * self.decay + ls
+        self.count += 1
+        self.last = x
+        return self.value
+
+    def revise(self, x: float) -> float:
+        self.num_g, self.num_l, self.count, self.last = self._undo
+        return self.push(x)
+
+
+class OnlineIndicatorState:
+    """종목별 증분 지표 상태 (최초 1회 전체 이력으로 초기화, 이후 새 봉만 반영)"""
+    __slots__ = ("last_date", "anchor", "smas", "rsi")
+
+    def __init__(self, periods: Tuple[int, ...], rsi_period: int):
+        self.last_date = None
+        self.anchor = None  # last_date 직전 봉 (날짜, 종가) — 확정된 값이므로 이어 붙일 기준
+        self.smas = {p: OnlineSMA(p) for p in periods}
+        self.rsi = OnlineRSI(rsi_period)
+
+    def _push(self, x: float):
+        for sma in self.smas.values():
+            sma.push(x)
+        self.rsi.push(x)
+
+    def _contiguous(self, dates, closes, pos: int) -> bool:
+        """저장된 상태가 들어온 프레임에 그대로 이어지는지 (직전 확정 봉의 날짜·종가 일치)"""
+        if self.anchor is None:
+            return True
+        if pos == 0:
+            return False
+        a_date, a_close = self.anchor
+        return dates[pos - 1] == a_date and closes[pos - 1] == a_close
+
+    def update(self, df: pd.DataFrame) -> Dict[str, float]:
+        dates = df.index
+        closes = df["종가"].to_numpy(dtype=np.float64)
+        start = 0
+        if self.last_date is not None:
+            pos = dates.searchsorted(self.last_date)
+            if pos < len(dates) and dates[pos] == self.last_date and self._contiguous(dates, closes, pos):
+                # 마지막으로 본 봉은 장중 값이 바뀌었을 수 있으므로 수정 후 이후 봉만 추가
+                x = closes[pos]
+                for sma in self.smas.values():
+                    sma.revise(x)
+                self.rsi.revise(x)
+                start = pos + 1
+            else:  # 이력 단절(누락 봉·수정주가) → 재초기화 후 전체 이력으로 다시 계산
+                self.__init__(tuple(self.smas), self.rsi.period)
+        for x in closes[start:]:
+            self._push(x)
+        if len(dates):
+            self.last_date = dates[-1]
+            self.anchor = (dates[-2], closes[-2]) if len(dates) >= 2 else None
+
+        result = {"RSI": self.rsi.value}
+        for p, sma in self.smas.items():
+            result[f"MA{p}"] = sma.value
+            result[f"MA{p}_prev"] = sma.prev
+        return result
+
+
+_online_states: Dict[tuple, OnlineIndicatorState] = {}
+
+
+def online_update(
+    ticker: str, df: pd.DataFrame, periods: Tuple[int, ...] = (5, 20, 60, 120), rsi_period: int = 14
+) -> Dict[str, float]:
+    """종목 최신 MA/RSI (프로세스 내 상태 유지 — 반복 호출 시 새 봉만 계산)"""
+    key = (ticker, tuple(periods), rsi_period)
+    state = _online_states.get(key)
+    if state is None:
+        state = _online_states.setdefault(key, OnlineIndicatorState(tuple(periods), rsi_period))
+    return state.update(df)
+
+
+def reset_online_state():
+    """증분 지표 상태 전체 초기화 (일일 보고 시점마다 호출 — 매도된 종목 상태가 쌓이지 않도록)"""
+    _online_states.clear()
+
+
 # ──────────────────────────────────────────
 # 싱글톤 인스턴스
 # ──────────────────────────────────────────
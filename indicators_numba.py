@@ -0,0 +1,146 @@
+"""
+╔══════════════════════════════════════════════════════════╗
+║  기술적 지표 고속 커널 (Numba JIT)                          ║
+║  numba 미설치 시 동일 코드를 순수 Python으로 실행             ║
+╚══════════════════════════════════════════════════════════╝
+"""
+import logging
+import numpy as np
+
+# numba 설치 시 JIT 컴파일 (미설치 시 데코레이터 무시)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+logger = logging.getLogger(__name__)
+
+
+# ══════════════════════════════════════
+# 1. RSI (Wilder 평활, 단일 패스)
+# ══════════════════════════════════════
+@njit(cache=True)
+def rsi_kernel(x, period):
+    """
+    RSI 1회 순회 계산 (α = 1/period)
+    pandas ewm(com=period-1, min_periods=period) 결과와 동일 — 초기 구간/손실 0은 50
+    """
+    n = len(x)
+    out = np.full(n, 50.0)
+    decay = 1.0 - 1.0 / period
+    num_g = 0.0
+    num_l = 0.0
+    for i in range(n):
+        g = 0.0
+        ls = 0.0
+        if i > 0:
+            d = x[i] - x[i - 1]
+            if d > 0:
+                g = d
+            elif d < 0:
+                ls = -d
+        num_g = num_g * decay + g
+        num_l = num_l * decay + ls
+        if i >= period - 1 and num_l > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + num_g / num_l)
+    return out
+
+
+# ══════════════════════════════════════
+# 2. 패널 지표 (행=날짜, 열=종목 — 종목 축 병렬)
+# ══════════════════════════════════════
+@njit(parallel=True, cache=True)
+def panel_sma(x, period, out):
+    """
+    (T, N) 종가 패널의 단순 이동평균 → out (앞쪽 NaN 패딩 허용)
+    창 안에 NaN이 있으면 NaN (pandas rolling(min_periods=period)와 동일)
+    """
+    n, m = x.shape
+    for j in prange(m):
+        total = 0.0
+        count = 0
+        for i in range(n):
+            v = x[i, j]
+            if not np.isnan(v):
+                total += v
+                count += 1
+            if i >= period:
+                old = x[i - period, j]
+                if not np.isnan(old):
+                    total -= old
+                    count -= 1
+            out[i, j] = total / period if count == period else np.nan
+
+
+@njit(parallel=True, cache=True)
+def panel_atr(h, l, c, period, out):
+    """(T, N) 고가/저가/종가 패널의 ATR → out (전일 종가 없으면 고가-저가)"""
+    n, m = c.shape
+    for j in prange(m):
+        total = 0.0
+        count = 0
+        tr = np.empty(n)
+        for i in range(n):
+            t = h[i, j] - l[i, j]
+            if i > 0 and not np.isnan(c[i - 1, j]):
+                t = max(t, abs(h[i, j] - c[i - 1, j]), abs(l[i, j] - c[i - 1, j]))
+            tr[i] = t
+            if not np.isnan(t):
+                total += t
+                count += 1
+            if i >= period and not np.isnan(tr[i - period]):
+                total -= tr[i - period]
+                count -= 1
+            out[i, j] = total / period if count == period else np.nan
+
+
+# ══════════════════════════════════════
+# 3. 교집합 등급 판정
+# ══════════════════════════════════════
+@njit(cache=True)
+def grade_kernel(pattern_count, buy_count, market_ok, codes):
+    """
+    신호별 교집합 등급 코드 → codes
+    0=S(3중+수급+시장) / 1=A / 2=B+(수급 미달) / 3=B+(시장 미달) / 4=B(단일 전략)
+    신호 수가 수백 건 이하라 단일 스레드 루프 (prange 스레드 풀 기동 비용이 더 큼)
+    """
+    for i in range(len(pattern_count)):
+        if pattern_count[i] < 2:
+            codes[i] = 4
+        elif buy_count[i] < 2:
+            codes[i] = 2
+        elif not market_ok:
+            codes[i] = 3
+        elif pattern_count[i] >= 3:
+            codes[i] = 0
+        else:
+            codes[i] = 1
+
+
+# ══════════════════════════════════════
+# 4. JIT 예열 (스캐너/에이전트 시작 시 1회 — 첫 스캔에서 컴파일 지연 제거)
+# ══════════════════════════════════════
+def warmup() -> None:
+    """
+    실제 호출과 같은 타입으로 각 커널을 1회 실행 (cache=True면 디스크 캐시 적재만 수행)
+    import 시에는 실행하지 않음 — 스캔을 돌리는 프로세스의 시작 경로에서 명시적으로 호출
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        rsi_kernel(np.ones(64), 14)
+        p = np.ones((64, 2))
+        out = np.empty_like(p)
+        panel_sma(p, 5, out)
+        panel_atr(p, p, p, 14, out)
+        cnt = np.ones(8, dtype=np.int64)
+        grade_kernel(cnt, cnt, True, np.empty(8, dtype=np.int8))
+    except Exception as e:
+        logger.warning("numba 커널 예열 실패 (첫 호출 시 컴파일): %s", e)
@@ -13,10 +13,11 @@
 import os
 import sys
 import time
+import heapq
 import logging
 import signal
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # ──────────────────────────────────────────
 # 로깅 설정
@@ -31,6 +32,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger("agent")
 
+_BANNER_RULE = "=" * 60  # 시작 배너 구분선
+
 # ──────────────────────────────────────────
 # 설정 로드
 # ──────────────────────────────────────────
@@ -39,6 +42,8 @@ from config import (
     risk_config, supabase_config,
 )
 from scanner import QuantScanner
+from indicators import reset_online_state
+from indicators_numba import warmup as warmup_kernels
 from risk_manager import risk_manager
 from report_generator import ReportGenerator
 from telegram_bot import trading_bot
@@ -149,25 +154,26 @@ def check_holdings():
             msg = supa.format_alert_message(alert)
             trading_bot.send_message(msg)
             logger.warning(
-                f"🚨 알림: {alert['name']} [{alert['status']}] "
-                f"({alert['pnl_pct']:+.1f}%)"
+                "🚨 알림: %s [%s] (%+.1f%%)",
+                alert["name"], alert["status"], alert["pnl_pct"],
             )
 
         if alerts:
-            logger.info(f"⚠️ {len(alerts)}건 알림 전송")
-        else:
+            logger.info("⚠️ %d건 알림 전송", len(alerts))
+        elif logger.isEnabledFor(logging.DEBUG):
+            # 보유종목 재조회는 DEBUG 로그용이므로 DEBUG 비활성 시 생략
             holdings_count = len(supa.get_all_holdings())
             if holdings_count > 0:
-                logger.debug(f"✅ 보유 {holdings_count}종목 이상 없음")
+                logger.debug("✅ 보유 %d종목 이상 없음", holdings_count)
 
     except Exception as e:
-        logger.error(f"보유종목 체크 실패: {e}")
+        logger.error("보유종목 체크 실패: %s", e)
 
 
 # ──────────────────────────────────────────
 # 일일 보고
 # ──────────────────────────────────────────
-_daily_reported = False
+_daily_reported = None  # 마지막 보고 날짜 (하루 1회)
 
 
 def check_daily_report():
@@ -176,13 +182,21 @@ def check_daily_report():
     now = datetime.now()
 
     if now.hour == system_config.daily_report_hour and now.minute < 2:
-        if not _daily_reported:
+        if _daily_reported != now.date():
             report = supa.generate_daily_summary()
             trading_bot.send_message(report)
             logger.info("📊 일일 보고서 전송 완료")
-            _daily_reported = True
-    else:
-        _daily_reported = False
+            _daily_reported = now.date()
+            reset_online_state()
+
+
+def seconds_until_daily_report() -> float:
+    """다음 일일 보고 시각까지 남은 초"""
+    now = datetime.now()
+    t = now.replace(hour=system_config.daily_report_hour, minute=0, second=0, microsecond=0)
+    if t <= now:
+        t += timedelta(days=1)
+    return (t - now).total_seconds()
 
 
 # ──────────────────────────────────────────
@@ -204,6 +218,22 @@ def is_pre_market() -> bool:
     return 800 <= hour_min <= 854
 
 
+# 장 구간 경계 (장전 시작 / 장 시작 / 장 마감 후) — 경계를 넘으면 주기 재계산
+_PHASE_BOUNDARIES = ((8, 0), (8, 55), (15, 41))
+
+
+def seconds_until_phase_change() -> float:
+    """다음 장 구간 경계까지 남은 초"""
+    now = datetime.now()
+    for hour, minute in _PHASE_BOUNDARIES:
+        t = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if t > now:
+            return (t - now).total_seconds()
+    hour, minute = _PHASE_BOUNDARIES[0]
+    t = (now + timedelta(days=1)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return (t - now).total_seconds()
+
+
 # ══════════════════════════════════════════
 # 메인 에이전트 루프
 # ══════════════════════════════════════════
@@ -212,6 +242,7 @@ class QuantAgent:
 
     def __init__(self):
         self.running = True
+        self._stop = threading.Event()
         self._scan_count = 0
         self._check_count = 0
         signal.signal(signal.SIGINT, self._handle_shutdown)
@@ -220,10 +251,39 @@ class QuantAgent:
     def _handle_shutdown(self, signum, frame):
         logger.info("🛑 종료 신호 수신 — 안전하게 종료합니다")
         self.running = False
+        self._stop.set()
+
+    # 작업별 실행 → 다음 실행까지 대기 초 반환 (장 구간이 바뀌면 그 시점에 재판단)
+    def _run_check(self) -> float:
+        if is_market_hours():
+            check_holdings()
+            self._check_count += 1
+            interval = system_config.holdings_check_interval * 60
+        else:
+            if not is_pre_market():
+                check_holdings()
+            interval = 1800
+        return min(interval, seconds_until_phase_change())
+
+    def _run_scan(self) -> float:
+        if is_market_hours():
+            market = check_market_status()
+            run_strategy_scan(market)
+            self._scan_count += 1
+        elif is_pre_market():
+            logger.info("⏰ 장 시작 전 — 시장 상태 사전 분석")
+            check_market_status()
+        else:
+            return seconds_until_phase_change()
+        return min(system_config.scan_interval_minutes * 60, seconds_until_phase_change())
+
+    def _run_report(self) -> float:
+        check_daily_report()
+        return seconds_until_daily_report()
 
     def start(self):
         """에이전트 시작"""
-        logger.info("=" * 60)
+        logger.info(_BANNER_RULE)
         logger.info("🚀 퀀트 에이전트 v2 시작")
         logger.info(f"   📊 전략 스캔: {system_config.scan_interval_minutes}분 주기")
         logger.info(f"   📌 보유 감시: {system_config.holdings_check_interval}분 주기")
@@ -232,7 +292,10 @@ class QuantAgent:
         logger.info(f"   🔔 텔레그램: {'활성' if telegram_config.enabled else '비활성'}")
         logger.info(f"   💾 Supabase: {'연결' if supabase_config.enabled else '미연결'}")
         logger.info(f"   🎯 교집합: 3단계 AND 필터 (패턴+수급+시장)")
-        logger.info("=" * 60)
+        logger.info(_BANNER_RULE)
+
+        # 지표 커널 JIT 예열 (첫 스캔 컴파일 지연 제거)
+        warmup_kernels()
 
         # 텔레그램 봇 폴링 시작 (콜백 수신)
         trading_bot.start_polling()
@@ -249,51 +312,27 @@ class QuantAgent:
             "/help 로 명령어를 확인하세요."
         )
 
-        # 메인 루프
-        scan_interval = system_config.scan_interval_minutes * 60
-        check_interval = system_config.holdings_check_interval * 60
-        last_scan = 0
-        last_check = 0
+        # 메인 루프: (실행 시각, 작업) 힙 — 다음 작업 시각까지 대기, 종료 신호 시 즉시 깨어남
+        tasks = {"check": self._run_check, "scan": self._run_scan, "report": self._run_report}
+        now = time.monotonic()
+        schedule = [(now, "check"), (now, "scan"), (now + seconds_until_daily_report(), "report")]
+        heapq.heapify(schedule)
 
-        while self.running:
-            now = time.time()
+        while not self._stop.is_set():
+            due, task = schedule[0]
+            if self._stop.wait(max(0.0, due - time.monotonic())):
+                break
 
             try:
-                # ── 장 시간 ──
-                if is_market_hours():
-                    # 보유 종목 체크 (1분)
-                    if now - last_check >= check_interval:
-                        check_holdings()
-                        self._check_count += 1
-                        last_check = now
-
-                    # 전략 스캔 (5분)
-                    if now - last_scan >= scan_interval:
-                        market = check_market_status()
-                        run_strategy_scan(market)
-                        self._scan_count += 1
-                        last_scan = now
-
-                # ── 장 시작 전 ──
-                elif is_pre_market():
-                    if now - last_scan >= scan_interval:
-                        logger.info("⏰ 장 시작 전 — 시장 상태 사전 분석")
-                        check_market_status()
-                        last_scan = now
-
-                # ── 장 외 시간 ──
-                else:
-                    check_daily_report()
-                    if now - last_check >= 1800:
-                        check_holdings()
-                        last_check = now
-
+                delay = tasks[task]()
             except Exception as e:
-                logger.error(f"메인 루프 오류: {e}")
+                logger.error("메인 루프 오류 (%s): %s", task, e)
+                delay = 10  # 실패 시 10초 후 재시도
 
-            time.sleep(10)
+            heapq.heapreplace(schedule, (time.monotonic() + delay, task))
 
-        # 종료
+        # 종료 (대기 중인 신호 알림 발송 완료 후)
+        QuantScanner.flush_telegram()
         trading_bot.stop_polling()
         trading_bot.send_message(
             f"🏁 *에이전트 종료*\n"
@@ -6,15 +6,83 @@
 """
 import json
 import logging
+import requests
+from functools import lru_cache
+import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime
 
 from strategies import StrategySignal, StrategyType
+from indicators import ACCUM_DTYPE, accumulation_records
 from risk_manager import MarketCondition, StopLossReport
 
 logger = logging.getLogger(__name__)
 
 
+# 콘솔 보고서 고정 테두리 (호출마다 재생성하지 않음)
+_DIVIDER = "═" * 52
+_MC_HEADER = "\n╔" + "═" * 46 + "╗"
+_MC_SEP = "╠" + "═" * 46 + "╣"
+_MC_FOOTER = "╚" + "═" * 46 + "╝"
+_PHASE_EMOJI = {"BULL": "🟢", "BEAR": "🔴", "NEUTRAL": "🟡"}
+
+
+# 콘솔 신호 보고 템플릿 (근거 줄 수만 가변 — 미리 이어 붙여 한 번에 치환)
+_SIGNAL_CONSOLE_TMPL = (
+    "\n" + _DIVIDER + "\n"
+    "  📊 {name}({ticker}) / {price} / {strategy}\n"
+    + _DIVIDER + "\n"
+    "\n"
+    "  🔍 핵심 근거:\n"
+    "{reasons}"
+    "\n"
+    "  🎯 매수 타점:\n"
+    "     • 1차 매수가: {entry_1}\n"
+    "     • 2차 매수가: {entry_2}\n"
+    "\n"
+    "  📈 목표가 / 📉 손절가:\n"
+    "     • 1차 목표가: {target_1}\n"
+    "     • 2차 목표가: {target_2}\n"
+    "     • 손절가:     {stop}\n"
+    "     • R:R 비율:   {rr:.1f}\n"
+    "\n"
+    "  ⚡ 신뢰도: {confidence:.0f}%\n"
+    "  {verdict_emoji} 승인 여부: [{verdict}]\n"
+    + _DIVIDER
+)
+
+
+# 텔레그램 신호 보고 템플릿 (format_map 으로 치환)
+_SIGNAL_TELEGRAM_TMPL = """📊 *{name}* ({ticker})
+💰 현재가: {price}
+🏷️ 전략: *{strategy}*
+
+🔍 *핵심 근거:*
+{reasons}
+🎯 *매수 타점:*
+  • 1차: {entry_1}
+  • 2차: {entry_2}
+
+📈 *목표가/손절가:*
+  • 1차 목표: {target_1}
+  • 2차 목표: {target_2}
+  • 손절가: {stop}
+  • R:R = {rr:.1f}
+
+⚡ 신뢰도: {confidence:.0f}%
+{verdict_emoji} *[{verdict}]*"""
+
+
+# 텔레그램 Markdown(레거시) 특수문자 이스케이프 표 — 종목명에 _ * [ ` 가 있으면 파싱 실패
+_MD_ESCAPE = str.maketrans({"_": "\\_", "*": "\\*", "[": "\\[", "`": "\\`"})
+
+
+@lru_cache(maxsize=4096)
+def _won(n: float) -> str:
+    """가격 → "12,345원" (같은 가격이 콘솔/텔레그램에서 반복 포맷됨)"""
+    return f"{int(n):,}원"
+
+
 class ReportGenerator:
     """보고서 생성기"""
 
@@ -24,56 +92,36 @@ class ReportGenerator:
     @staticmethod
     def format_signal_console(signal: StrategySignal) -> str:
         """전략 신호를 콘솔 출력 형식으로 변환"""
-        divider = "═" * 52
-        lines = [
-            f"\n{divider}",
-            f"  📊 {signal.name}({signal.ticker}) / {int(signal.current_price):,}원 / {signal.strategy.value}",
-            f"{divider}",
-            "",
-            f"  🔍 핵심 근거:",
-        ]
-        for i, reason in enumerate(signal.reasons, 1):
-            lines.append(f"     {i}. {reason}")
-
-        lines.extend([
-            "",
-            f"  🎯 매수 타점:",
-            f"     • 1차 매수가: {int(signal.entry_price_1):,}원",
-            f"     • 2차 매수가: {int(signal.entry_price_2):,}원",
-            "",
-            f"  📈 목표가 / 📉 손절가:",
-            f"     • 1차 목표가: {int(signal.target_price_1):,}원",
-            f"     • 2차 목표가: {int(signal.target_price_2):,}원",
-            f"     • 손절가:     {int(signal.stop_loss):,}원",
-            f"     • R:R 비율:   {signal.risk_reward_ratio:.1f}",
-            "",
-            f"  ⚡ 신뢰도: {signal.confidence:.0f}%",
-            f"  {'✅' if signal.verdict == '매수 승인' else '⏸️'} 승인 여부: [{signal.verdict}]",
-            f"{divider}",
-        ])
-        return "\n".join(lines)
+        return _SIGNAL_CONSOLE_TMPL.format_map({
+            "name": signal.name,
+            "ticker": signal.ticker,
+            "price": _won(signal.current_price),
+            "strategy": signal.strategy.value,
+            "reasons": "".join(f"     {i}. {reason}\n" for i, reason in enumerate(signal.reasons, 1)),
+            "entry_1": _won(signal.entry_price_1),
+            "entry_2": _won(signal.entry_price_2),
+            "target_1": _won(signal.target_price_1),
+            "target_2": _won(signal.target_price_2),
+            "stop": _won(signal.stop_loss),
+            "rr": signal.risk_reward_ratio,
+            "confidence": signal.confidence,
+            "verdict_emoji": "✅" if signal.verdict == "매수 승인" else "⏸️",
+            "verdict": signal.verdict,
+        })
 
     @staticmethod
     def format_market_condition_console(condition: MarketCondition) -> str:
         """시장 상태를 콘솔 출력 형식으로 변환"""
-        phase_emoji = {
-            "BULL": "🟢", "BEAR": "🔴", "NEUTRAL": "🟡"
-        }
-        emoji = phase_emoji.get(condition.market_phase, "⚪")
-
-        lines = [
-            "\n╔══════════════════════════════════════════════╗",
+        emoji = _PHASE_EMOJI.get(condition.market_phase, "⚪")
+        return "\n".join([
+            _MC_HEADER,
             f"║  {emoji} 시장 상태: {condition.market_phase}",
-            "╠══════════════════════════════════════════════╣",
-        ]
-        for reason in condition.reasons:
-            lines.append(f"║  {reason}")
-        lines.extend([
+            _MC_SEP,
+            *(f"║  {reason}" for reason in condition.reasons),
             f"║  최대 투자비중: {condition.max_weight:.0%}",
             f"║  허용 전략: {', '.join(condition.allowed_strategies)}",
-            "╚══════════════════════════════════════════════╝",
+            _MC_FOOTER,
         ])
-        return "\n".join(lines)
 
     # ══════════════════════════════════════
     # 2. 텔레그램 보고서
@@ -81,45 +129,34 @@ class ReportGenerator:
     @staticmethod
     def format_signal_telegram(signal: StrategySignal) -> str:
         """텔레그램 마크다운 형식 보고서"""
-        verdict_emoji = "✅" if signal.verdict == "매수 승인" else "⏸️"
-
-        msg = f"""
-📊 *{signal.name}* ({signal.ticker})
-💰 현재가: {int(signal.current_price):,}원
-🏷️ 전략: *{signal.strategy.value}*
-
-🔍 *핵심 근거:*
-"""
-        for i, reason in enumerate(signal.reasons, 1):
-            msg += f"  {i}. {reason}\n"
-
-        msg += f"""
-🎯 *매수 타점:*
-  • 1차: {int(signal.entry_price_1):,}원
-  • 2차: {int(signal.entry_price_2):,}원
-
-📈 *목표가/손절가:*
-  • 1차 목표: {int(signal.target_price_1):,}원
-  • 2차 목표: {int(signal.target_price_2):,}원
-  • 손절가: {int(signal.stop_loss):,}원
-  • R:R = {signal.risk_reward_ratio:.1f}
-
-⚡ 신뢰도: {signal.confidence:.0f}%
-{verdict_emoji} *[{signal.verdict}]*
-"""
-        return msg.strip()
+        return _SIGNAL_TELEGRAM_TMPL.format_map({
+            "name": signal.name.translate(_MD_ESCAPE),
+            "ticker": signal.ticker,
+            "price": _won(signal.current_price),
+            "strategy": signal.strategy.value,
+            "reasons": "".join(f"  {i}. {reason}\n" for i, reason in enumerate(signal.reasons, 1)),
+            "entry_1": _won(signal.entry_price_1),
+            "entry_2": _won(signal.entry_price_2),
+            "target_1": _won(signal.target_price_1),
+            "target_2": _won(signal.target_price_2),
+            "stop": _won(signal.stop_loss),
+            "rr": signal.risk_reward_ratio,
+            "confidence": signal.confidence,
+            "verdict_emoji": "✅" if signal.verdict == "매수 승인" else "⏸️",
+            "verdict": signal.verdict,
+        })
 
     @staticmethod
     def format_stop_loss_telegram(report: StopLossReport) -> str:
         """손절 리포트 텔레그램 형식"""
         emoji = "🚨" if report.triggered else "✅"
         msg = f"""
-{emoji} *손절 알림: {report.name}* ({report.ticker})
-📊 매수가: {int(report.entry_price):,}원
-💰 현재가: {int(report.current_price):,}원
+{emoji} *손절 알림: {report.name.translate(_MD_ESCAPE)}* ({report.ticker})
+📊 매수가: {_won(report.entry_price)}
+💰 현재가: {_won(report.current_price)}
 📉 손익률: {report.loss_pct:+.2f}%
-🛑 손절가: {int(report.stop_loss_price):,}원
-📐 20일선: {int(report.ma20_price):,}원
+🛑 손절가: {_won(report.stop_loss_price)}
+📐 20일선: {_won(report.ma20_price)}
 
 ⚠️ *사유:* {report.trigger_reason}
 🎬 *조치:* {report.action}
@@ -148,7 +185,7 @@ class ReportGenerator:
             "market_cap": signal.market_cap,
             "reasons": signal.reasons,
             "verdict": signal.verdict,
-            "details": _safe_serialize(signal.details),
+            "details": signal.details,  # numpy 값은 직렬화 시 json_default 에서 변환
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -187,28 +224,17 @@ class ReportGenerator:
         }
 
 
-def _safe_serialize(obj):
-    """JSON 직렬화 안전 변환 (numpy 타입 포함)"""
-    import numpy as np
-
-    if isinstance(obj, dict):
-        return {k: _safe_serialize(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_safe_serialize(v) for v in obj]
-    elif isinstance(obj, (np.bool_,)):
-        return bool(obj)
-    elif isinstance(obj, (np.integer,)):
-        return int(obj)
-    elif isinstance(obj, (np.floating,)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
+def json_default(obj):
+    """JSON 직렬화 default 훅 (orjson/json 공용) — numpy·날짜·매집봉 배열 변환"""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == ACCUM_DTYPE:
+            return accumulation_records(obj)
         return obj.tolist()
-    elif isinstance(obj, (int, float, str, bool, type(None))):
-        return obj
-    elif hasattr(obj, 'isoformat'):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
         return obj.isoformat()
-    else:
-        return str(obj)
+    return str(obj)
 
 
 # ──────────────────────────────────────────
@@ -220,18 +246,19 @@ class TelegramSender:
     def __init__(self, bot_token: str, chat_id: str):
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        # 연결 재사용 (신호마다 TCP+TLS 핸드셰이크 반복 방지)
+        self._session = requests.Session()
 
     def send_message(self, text: str) -> bool:
         """텔레그램 메시지 전송"""
-        import requests
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
         payload = {
             "chat_id": self.chat_id,
             "text": text,
             "parse_mode": "Markdown",
         }
         try:
-            resp = requests.post(url, json=payload, timeout=10)
+            resp = self._session.post(self.url, json=payload, timeout=10)
             return resp.status_code == 200
         except Exception as e:
             logger.error(f"텔레그램 전송 실패: {e}")
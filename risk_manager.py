@@ -5,19 +5,21 @@
 ╚══════════════════════════════════════════════════════════╝
 """
 import pandas as pd
+import numpy as np
 import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from config import risk_config
+from config import risk_config, DATACLASS_SLOTS
 from data_collector import collector
 from indicators import TechnicalIndicators as TI
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MarketCondition:
     """시장 상태 분석 결과"""
     kospi_above_ma5: bool = False
@@ -33,7 +35,7 @@ class MarketCondition:
     timestamp: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StopLossReport:
     """손절 리포트"""
     ticker: str = ""
@@ -69,37 +71,13 @@ class RiskManager:
             allowed_strategies=["pullback", "bottom_escape", "golden_cross", "breakout", "convergence"],
         )
 
-        # 코스피 지수 분석
-        kospi = collector.get_market_index("1001", 30)
-        if not kospi.empty and len(kospi) >= 5:
-            ma5 = kospi["종가"].rolling(5).mean()
-            condition.kospi_value = float(kospi["종가"].iloc[-1])
-            condition.kospi_ma5 = float(ma5.iloc[-1])
-            condition.kospi_above_ma5 = bool(kospi["종가"].iloc[-1] > ma5.iloc[-1])
-            if condition.kospi_above_ma5:
-                condition.reasons.append(
-                    f"코스피 5일선 위 ({kospi['종가'].iloc[-1]:,.0f} > MA5 {ma5.iloc[-1]:,.0f})"
-                )
-            else:
-                condition.reasons.append(
-                    f"⚠️ 코스피 5일선 이탈 ({kospi['종가'].iloc[-1]:,.0f} < MA5 {ma5.iloc[-1]:,.0f})"
-                )
-
-        # 코스닥 지수 분석
-        kosdaq = collector.get_market_index("2001", 30)
-        if not kosdaq.empty and len(kosdaq) >= 5:
-            ma5 = kosdaq["종가"].rolling(5).mean()
-            condition.kosdaq_value = float(kosdaq["종가"].iloc[-1])
-            condition.kosdaq_ma5 = float(ma5.iloc[-1])
-            condition.kosdaq_above_ma5 = bool(kosdaq["종가"].iloc[-1] > ma5.iloc[-1])
-            if condition.kosdaq_above_ma5:
-                condition.reasons.append(
-                    f"코스닥 5일선 위 ({kosdaq['종가'].iloc[-1]:,.0f} > MA5 {ma5.iloc[-1]:,.0f})"
-                )
-            else:
-                condition.reasons.append(
-                    f"⚠️ 코스닥 5일선 이탈 ({kosdaq['종가'].iloc[-1]:,.0f} < MA5 {ma5.iloc[-1]:,.0f})"
-                )
+        # 코스피 / 코스닥 지수 동시 조회 후 분석
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f_kospi = ex.submit(collector.get_market_index, "1001", 30)
+            f_kosdaq = ex.submit(collector.get_market_index, "2001", 30)
+            kospi, kosdaq = f_kospi.result(), f_kosdaq.result()
+        self._analyze_index(condition, kospi, "kospi", "코스피")
+        self._analyze_index(condition, kosdaq, "kosdaq", "코스닥")
 
         # 시장 상태 판별
         both_below = not condition.kospi_above_ma5 and not condition.kosdaq_above_ma5
@@ -124,6 +102,24 @@ class RiskManager:
 
         return condition
 
+    @staticmethod
+    def _analyze_index(condition: MarketCondition, index_df: pd.DataFrame, prefix: str, label: str) -> None:
+        """지수 종가 vs 5일 이동평균 → condition.{prefix}_* 기록 + 사유 추가"""
+        if index_df.empty or len(index_df) < 5:
+            return
+        close = index_df["종가"].to_numpy(dtype=np.float64)
+        last = close[-1]
+        ma5 = close[-5:].mean()
+        above = bool(last > ma5)
+
+        setattr(condition, f"{prefix}_value", float(last))
+        setattr(condition, f"{prefix}_ma5", float(ma5))
+        setattr(condition, f"{prefix}_above_ma5", above)
+        if above:
+            condition.reasons.append(f"{label} 5일선 위 ({last:,.0f} > MA5 {ma5:,.0f})")
+        else:
+            condition.reasons.append(f"⚠️ {label} 5일선 이탈 ({last:,.0f} < MA5 {ma5:,.0f})")
+
     # ══════════════════════════════════════
     # 2. 손절 자동화
     # ══════════════════════════════════════
@@ -132,11 +128,14 @@ class RiskManager:
         ticker: str,
         entry_price: float,
         stop_loss_price: float,
+        df: Optional[pd.DataFrame] = None,
+        ma20: Optional[float] = None,
     ) -> StopLossReport:
         """
         손절 조건 확인
         1) ATR 기반 손절가 이탈
         2) 20일선 종가 기준 이탈
+        (df/ma20 미지정 시 직접 조회·계산)
         """
         report = StopLossReport(
             ticker=ticker,
@@ -146,16 +145,20 @@ class RiskManager:
             timestamp=datetime.now().isoformat(),
         )
 
-        df = collector.get_ohlcv(ticker, 30)
+        if df is None:
+            df = collector.get_ohlcv(ticker, 30)
         if df.empty:
             return report
 
-        df = TI.add_all_ma(df, [20])
         current_price = df["종가"].iloc[-1]
         report.current_price = current_price
 
         # 20일선 가격
-        ma20 = df["MA20"].iloc[-1] if "MA20" in df.columns and pd.notna(df["MA20"].iloc[-1]) else None
+        if ma20 is None:
+            df = TI.add_all_ma(df, [20])
+            ma20 = df["MA20"].iloc[-1] if "MA20" in df.columns and pd.notna(df["MA20"].iloc[-1]) else None
+        elif np.isnan(ma20):
+            ma20 = None
         report.ma20_price = ma20 if ma20 else 0.0
 
         # 손익률 계산
@@ -181,12 +184,26 @@ class RiskManager:
 
     def generate_stop_loss_report(self, positions: List[dict]) -> List[StopLossReport]:
         """전체 보유 종목 손절 리포트 생성"""
+        # 보유 종목 일봉 병렬 일괄 조회
+        tickers = list(dict.fromkeys(pos["ticker"] for pos in positions))
+        ohlcv = collector.batch_ohlcv(tickers, 30) if tickers else {}
+
+        # 20일선: 20봉 이상 종목의 최근 종가를 (N, 20) 행렬로 모아 한 번에 평균
+        ma20 = {}
+        full = [t for t in tickers if t in ohlcv and len(ohlcv[t]) >= 20]
+        if full:
+            closes = np.vstack([ohlcv[t]["종가"].to_numpy(dtype=np.float64)[-20:] for t in full])
+            ma20 = dict(zip(full, closes.mean(axis=1).tolist()))
+
         reports = []
         for pos in positions:
+            ticker = pos["ticker"]
             report = self.check_stop_loss(
-                ticker=pos["ticker"],
+                ticker=ticker,
                 entry_price=pos["entry_price"],
                 stop_loss_price=pos["stop_loss"],
+                df=ohlcv.get(ticker),
+                ma20=ma20.get(ticker),
             )
             reports.append(report)
         return reports
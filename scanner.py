@@ -4,23 +4,42 @@
 ║  필터링 → 전략 판별 → 리스크 → 보고                        ║
 ╚══════════════════════════════════════════════════════════╝
 """
+import io
+import os
+import glob
 import time
 import json
 import logging
 import sys
+import queue
+import itertools
 from datetime import datetime
 from typing import List
 import threading
+import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 
 from config import (
     filter_config, telegram_config, system_config,
     kis_config, strategy_config
 )
-from data_collector import collector
-from strategies import engine as strategy_engine, StrategySignal
+from data_collector import collector, KIS_MAX_CONCURRENCY
+from strategies import engine as strategy_engine
 from risk_manager import risk_manager
-from report_generator import reporter, ReportGenerator, TelegramSender
+from indicators import TechnicalIndicators as TI
+from report_generator import reporter, ReportGenerator, TelegramSender, json_default
+
+# orjson 설치 시 numpy 타입을 C 레벨에서 직접 직렬화 (미설치 시 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgpack 설치 시 결과 파일을 바이너리(.msgpack)로도 저장 — 대시보드 로딩용
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # ──────────────────────────────────────────
 # 로깅 설정
@@ -35,6 +54,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 컬럼형 결과 필드 (대시보드 표/차트용 — 가격은 원 단위 정수)
+_COLUMNAR_TEXT = {"tickers": "ticker", "names": "name", "strategies": "strategy", "verdicts": "verdict"}
+_COLUMNAR_INT = ("current_price", "entry_price_1", "entry_price_2",
+                 "target_price_1", "target_price_2", "stop_loss", "market_cap")
+_COLUMNAR_FLOAT = ("confidence", "risk_reward_ratio")
+
+_LOG_RULE = "=" * 50  # 로그 구분선
+
+
+# 텔레그램 발송 큐 — 스캐너 인스턴스가 매 스캔마다 새로 생성돼도 워커 스레드는 프로세스당 1개
+_tg_queue: "queue.Queue" = queue.Queue()
+_tg_worker_lock = threading.Lock()
+_tg_worker: threading.Thread = None
+
+
+def _tg_drain():
+    """(sender, signal) 을 꺼내 순차 발송 (HTTPS 지연이 스캔 스레드를 막지 않도록 분리)"""
+    while True:
+        sender, signal = _tg_queue.get()
+        try:
+            sender.send_signal(signal)
+        except: pass
+        finally:
+            _tg_queue.task_done()
+
+
+def _start_tg_worker():
+    global _tg_worker
+    with _tg_worker_lock:
+        if _tg_worker is None or not _tg_worker.is_alive():
+            _tg_worker = threading.Thread(target=_tg_drain, name="telegram-sender", daemon=True)
+            _tg_worker.start()
+
+
+def _columnar(sigs: List[dict]) -> dict:
+    """신호 dict 리스트 → 필드별 numpy 배열 (문자열 / 원 단위 정수 / 실수)"""
+    cols = {key: np.array([s.get(f, "") for s in sigs], dtype=str) for key, f in _COLUMNAR_TEXT.items()}
+    for f in _COLUMNAR_INT:
+        cols[f] = np.array([s.get(f) or 0 for s in sigs], dtype=np.int64)
+    for f in _COLUMNAR_FLOAT:
+        cols[f] = np.array([s.get(f) or 0.0 for s in sigs], dtype=np.float64)
+    return cols
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 os.replace — 읽는 쪽(대시보드/API)이 쓰다 만 파일을 보지 않도록"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _json_line(obj) -> bytes:
+    """NDJSON 한 줄 직렬화 (orjson 우선)"""
+    if orjson:
+        return orjson.dumps(
+            obj,
+            default=json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (json.dumps(obj, ensure_ascii=False, default=json_default) + "\n").encode("utf-8")
+
 
 class QuantScanner:
     """퀀트 트레이딩 전체 스캐너"""
@@ -46,6 +134,7 @@ class QuantScanner:
                 telegram_config.bot_token,
                 telegram_config.chat_id,
             )
+            _start_tg_worker()
         self.scan_results: List[dict] = []
         self.market_condition = None
         self.progress = {
@@ -54,7 +143,8 @@ class QuantScanner:
             "active_logs": [],
             "strategy_progress": {}
         }
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()            # 스캔 동시 실행 방지 (run_scan 전체 구간 점유)
+        self._progress_lock = threading.Lock()   # 진행률 스냅샷 게시용 (5종목마다)
         self.active_logs = {}
         self.strategy_counts = {} # 전략별 완료 카운트
 
@@ -65,6 +155,7 @@ class QuantScanner:
         with self._lock:
             params = scan_params or {}
             start_time = time.time()
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')  # 결과 파일명 공통 시각
             results = {
                 "scan_time": datetime.now().isoformat(),
                 "market_condition": {},
@@ -82,7 +173,7 @@ class QuantScanner:
             # Step 1: 시장 상태 분석
             # ─────────────────────────────────
             self.progress = {"percent": 5, "message": "📊 증시 상황 분석 중..."}
-            logger.info("=" * 50)
+            logger.info(_LOG_RULE)
             logger.info("🔍 시장 상태 분석 중...")
             self.market_condition = risk_manager.analyze_market_condition()
             results["market_condition"] = ReportGenerator.market_condition_to_dict(
@@ -96,7 +187,7 @@ class QuantScanner:
             self.progress = {"percent": 15, "message": "📋 우량 종목 필터링 중..."}
             m_cap = params.get("min_market_cap")
             t_rank = params.get("top_rank")
-            logger.info(f"📋 종목 필터링 중 (시총: {m_cap or '기본'}, 순위: {t_rank or '기본'})...")
+            logger.info("📋 종목 필터링 중 (시총: %s, 순위: %s)...", m_cap or '기본', t_rank or '기본')
             filtered = collector.filter_stocks(min_market_cap=m_cap, top_rank=t_rank)
 
             if filtered.empty:
@@ -106,7 +197,12 @@ class QuantScanner:
             else:
                 ticker_list = filtered.index.tolist()[:100] # 최상위 100개만 엄선
             
-            logger.info(f"  → 정예 스캔 대상: {len(ticker_list)}개 종목")
+            logger.info("  → 정예 스캔 대상: %d개 종목", len(ticker_list))
+
+            # 공용 일봉(100일) 병렬 선조회 + 전 종목 MA/ATR 일괄 계산 (전략별 재계산 생략)
+            self.progress = {"percent": 18, "message": "📈 일봉 데이터 일괄 수집 중..."}
+            ohlcv_map = collector.batch_ohlcv(ticker_list, days=100)
+            TI.add_panel_indicators(list(ohlcv_map.values()))
 
             # ─────────────────────────────────
             # Step 3: 전략 판별 (동적 파라미터 반영)
@@ -131,7 +227,7 @@ class QuantScanner:
                 strategy_engine.params.convergence.convergence_pct = v.get("c_pct", 0.03)
 
             selected_strats = params.get("strategies")
-            allowed = selected_strats if selected_strats is not None else self.market_condition.allowed_strategies
+            allowed = frozenset(selected_strats if selected_strats is not None else self.market_condition.allowed_strategies)
             
             strategy_map = {
                 "pullback": strategy_engine.check_pullback,
@@ -141,64 +237,109 @@ class QuantScanner:
                 "convergence": strategy_engine.check_convergence,
             }
 
-            all_signals: List[StrategySignal] = []
+            all_signals: List[tuple] = []  # (StrategySignal, 직렬화 dict)
             total = len(ticker_list)
-            processed_count = 0
-            
-            # 병렬 분석 함수
-            def analyze_ticker(ticker_info):
-                nonlocal processed_count
-                stock_name = collector.get_stock_name(ticker_info)
-                
-                # 분석 시작 로그 업데이트
-                with self._lock:
+            self.active_logs = {}
+            self.strategy_counts = {}
+
+            # 일봉만으로 판정되는 조기 탈락 조건을 전략별로 전 종목 일괄 선별
+            gates = strategy_engine.prescreen(ohlcv_map)
+
+            def passes(ticker, strategy_key):
+                gate = gates.get(strategy_key)
+                return gate is None or ticker not in ohlcv_map or ticker in gate
+
+            # (종목, 전략) 단위 작업 — 종목별 완료 전략 수가 작업 수에 도달하면 해당 종목 완료
+            active = tuple((k, fn) for k, fn in strategy_map.items() if k in allowed)
+            jobs = [(t, k, fn) for t in ticker_list for k, fn in active if passes(t, k)]
+            n_jobs = {t: 0 for t in ticker_list}
+            for t, k, _ in jobs:
+                n_jobs[t] += 1
+            # 사전 선별 탈락분은 완료로 집계
+            for k, _ in active:
+                self.strategy_counts[k] = total - sum(1 for _, jk, _ in jobs if jk == k)
+            names = {t: collector.get_stock_name(t) for t in ticker_list}
+
+            # 진행률 카운터 — itertools.count 의 next() 는 GIL 하에서 원자적이므로 작업마다 락을 잡지 않음
+            ticker_done = {t: itertools.count(1) for t in ticker_list}
+            strat_done = {k: itertools.count(self.strategy_counts[k] + 1) for k, _ in active}
+            finished = itertools.count(sum(1 for n in n_jobs.values() if n == 0) + 1)
+            published = [0]  # 마지막으로 게시한 완료 종목 수 (역순 게시 방지)
+
+            # 발동 신호를 나오는 즉시 scan_signals_*.jsonl 에 한 줄씩 기록 (중단 시에도 부분 결과 보존)
+            stream = self._open_signal_stream(stamp)
+            stream_lock = threading.Lock()
+
+            def run_check(ticker_info, strategy_key, check_fn):
+                stock_name = names[ticker_info]
+                if ticker_info not in self.active_logs:
                     self.active_logs[ticker_info] = f"⏳ {stock_name} 분석 중..."
-                
-                # 분석 수행 (이 구간은 병렬로 진행)
-                for strategy_key, check_fn in strategy_map.items():
-                    if strategy_key not in allowed: continue
-                    try:
-                        signal = check_fn(ticker_info)
-                        if signal.triggered: sigs.append(signal)
-                        
-                        # 전략별 개별 진행률 카운트
-                        with self._lock:
-                            self.strategy_counts[strategy_key] = self.strategy_counts.get(strategy_key, 0) + 1
-                    except: pass
-                
-                # 진행률 및 종료 로그 업데이트
-                with self._lock:
-                    processed_count += 1
-                    curr_pct = 20 + int((processed_count / max(total, 1)) * 75)
+
+                signal = signal_dict = None
+                try:
+                    signal = check_fn(ticker_info)
+                except Exception:
+                    pass
+                if signal is not None and signal.triggered:
+                    signal_dict = ReportGenerator.signal_to_dict(signal)
+                    logger.info("  ✅ %s(%s) — %s (신뢰도 %.0f%%)",
+                                signal.name, ticker_info, signal.strategy.value, signal.confidence)
+                    if stream is not None:
+                        with stream_lock:
+                            try:
+                                stream.write(_json_line(signal_dict))
+                                stream.flush()
+                            except Exception:
+                                pass
+
+                # 전략별 개별 진행률 카운트
+                self.strategy_counts[strategy_key] = next(strat_done[strategy_key])
+                if next(ticker_done[ticker_info]) == n_jobs[ticker_info]:
+                    processed_count = next(finished)
                     self.active_logs[ticker_info] = f"✅ {stock_name} 완료"
-                    
-                    # 진행률과 함께 현재 활성 로그 및 전략별 퍼센트 계산
-                    display_logs = list(self.active_logs.values())[-5:]
-                    strat_prog = {k: int((v / max(total, 1)) * 100) for k, v in self.strategy_counts.items()}
-                    
-                    self.progress = {
-                        "percent": curr_pct, 
-                        "message": f"📊 {stock_name} 분석 완료 ({processed_count}/{total})",
-                        "active_logs": display_logs,
-                        "strategy_progress": strat_prog
-                    }
-                return sigs
-
-            # ThreadPool 활용하여 병렬 처리 (속도 향상)
-            max_workers = 5 # API 제한 고려
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_results = list(executor.map(analyze_ticker, ticker_list))
-                for sig_list in future_results:
-                    all_signals.extend(sig_list)
+
+                    # 진행률 스냅샷은 5종목마다(및 마지막) 한 번만 재구성 — 대시보드 폴링 주기엔 충분
+                    if processed_count % 5 == 0 or processed_count == total:
+                        with self._progress_lock:
+                            if processed_count > published[0]:
+                                published[0] = processed_count
+                                curr_pct = 20 + int((processed_count / max(total, 1)) * 75)
+
+                                # 진행률과 함께 현재 활성 로그 및 전략별 퍼센트 계산
+                                display_logs = list(self.active_logs.values())[-5:]
+                                strat_prog = {k: int((v / max(total, 1)) * 100) for k, v in self.strategy_counts.items()}
+
+                                self.progress = {
+                                    "percent": curr_pct,
+                                    "message": f"📊 {stock_name} 분석 완료 ({processed_count}/{total})",
+                                    "active_logs": display_logs,
+                                    "strategy_progress": strat_prog
+                                }
+                return (signal, signal_dict) if signal_dict is not None else None
+
+            # 종목×전략을 한꺼번에 병렬 처리 — 동시 실행 수는 KIS 동시 호출 상한에 맞춤
+            try:
+                with ThreadPoolExecutor(max_workers=KIS_MAX_CONCURRENCY) as executor:
+                    futures = [executor.submit(run_check, t, k, fn) for t, k, fn in jobs]
+                    for f in futures:  # 제출 순서(종목 → 전략)대로 수집
+                        hit = f.result()
+                        if hit is not None:
+                            all_signals.append(hit)
+            finally:
+                if stream is not None:
+                    stream.close()
 
             # ─────────────────────────────────
-            # Step 4: 결과 정렬 및 보고
+            # Step 4: 결과 정렬 및 보고 (dict 변환은 스트림 기록 시 1회)
             # ─────────────────────────────────
-            all_signals.sort(key=lambda s: s.confidence, reverse=True)
-            for signal in all_signals:
-                results["signals"].append(ReportGenerator.signal_to_dict(signal))
+            # 신뢰도 내림차순 (동률은 수집 순서 유지) — float 배열 argsort 로 정렬
+            if all_signals:
+                conf = np.fromiter((sig.confidence for sig, _ in all_signals), dtype=np.float64, count=len(all_signals))
+                all_signals = [all_signals[i] for i in np.argsort(-conf, kind="stable")]
+            for signal, signal_dict in all_signals:
+                results["signals"].append(signal_dict)
                 if self.telegram and signal.verdict == "매수 승인":
-                    self.telegram.send_signal(signal)
+                    _tg_queue.put((self.telegram, signal))
 
             # Summary
             elapsed = time.time() - start_time
@@ -210,38 +351,80 @@ class QuantScanner:
             }
 
             self.scan_results = results["signals"]
-            self._save_results(results)
+            self._save_results(results, stamp)
             self.progress = {"percent": 100, "message": "✅ 분석 완료"}
             return results
 
-    def _save_results(self, results: dict):
-        """스캔 결과를 JSON 파일로 저장"""
-        import numpy as np
-
-        class NumpyEncoder(json.JSONEncoder):
-            def default(self, obj):
-                if isinstance(obj, (np.integer,)):
-                    return int(obj)
-                elif isinstance(obj, (np.floating,)):
-                    return float(obj)
-                elif isinstance(obj, (np.bool_,)):
-                    return bool(obj)
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                return super().default(obj)
-
-        filename = f"scan_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    def _open_signal_stream(self, stamp: str):
+        """신호 스트림 파일(append) 열기 — 실패 시 None (스캔은 계속)"""
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(results, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
-            logger.info(f"💾 결과 저장: {filename}")
+            os.makedirs(system_config.results_dir, exist_ok=True)
+            return open(os.path.join(system_config.results_dir, f"scan_signals_{stamp}.jsonl"), "ab")
         except Exception as e:
-            logger.error(f"결과 저장 실패: {e}")
+            logger.error("신호 스트림 열기 실패: %s", e)
+            return None
+
+    def _save_results(self, results: dict, stamp: str = None):
+        """
+        스캔 결과를 JSON 파일로 저장 (임시 파일 → os.replace)
+        + 같은 이름의 .npz (수치 컬럼 압축 사이드카) / .msgpack (msgpack 설치 시)
+        """
+        stamp = stamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(system_config.results_dir, f"scan_result_{stamp}")
+        try:
+            os.makedirs(system_config.results_dir, exist_ok=True)
+            if orjson:
+                data = orjson.dumps(
+                    results,
+                    default=json_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2,
+                )
+            else:
+                data = json.dumps(results, ensure_ascii=False, indent=2, default=json_default).encode("utf-8")
+            _atomic_write(base + ".json", data)
+            logger.info("💾 결과 저장: %s.json", base)
+        except Exception as e:
+            logger.error("결과 저장 실패: %s", e)
+            return
+
+        try:
+            buf = io.BytesIO()
+            np.savez_compressed(buf, **_columnar(results.get("signals", [])))
+            _atomic_write(base + ".npz", buf.getvalue())
+        except Exception as e:
+            logger.error("컬럼형 결과 저장 실패: %s", e)
+
+        if msgpack:
+            try:
+                _atomic_write(base + ".msgpack", msgpack.packb(results, default=json_default, use_bin_type=True))
+            except Exception as e:
+                logger.error("msgpack 결과 저장 실패: %s", e)
+
+    @staticmethod
+    def flush_telegram():
+        """대기 중인 텔레그램 발송이 모두 끝날 때까지 대기 (종료 직전 호출)"""
+        if _tg_worker is not None and _tg_worker.is_alive():
+            _tg_queue.join()
 
     def get_latest_results(self) -> List[dict]:
         """최근 스캔 결과 반환 (대시보드 API용)"""
         return self.scan_results
 
+    def get_latest_results_columnar(self) -> dict:
+        """
+        최근 스캔 결과를 필드별 배열로 반환 (신호별 dict 대신 numpy 배열 — 대용량 응답용)
+        이번 프로세스에서 스캔 전이면 가장 최근 .npz 사이드카를 로드 (JSON 파싱 생략)
+        """
+        if not self.scan_results:
+            files = sorted(glob.glob(os.path.join(system_config.results_dir, "scan_result_*.npz")), reverse=True)
+            if files:
+                try:
+                    with np.load(files[0], allow_pickle=False) as npz:
+                        return {k: npz[k] for k in npz.files}
+                except Exception as e:
+                    logger.debug("컬럼형 결과 로드 실패: %s", e)
+        return _columnar(self.scan_results)
+
 
 # ──────────────────────────────────────────
 # CLI 실행
@@ -260,5 +443,8 @@ if __name__ == "__main__":
     ╚═══════════════════════════════════════════════════════╝
     """)
 
+    from indicators_numba import warmup
+    warmup()
+
     scanner = QuantScanner()
     results = scanner.run_scan()
@@ -4,44 +4,58 @@
 ║  5대 전략 스캔 + 관찰 리스트 + 교집합 판별                  ║
 ╚══════════════════════════════════════════════════════════╝
 """
+import io
 import json
 import os
+import glob
 import logging
 import numpy as np
+import pandas as pd
 from datetime import datetime
 from typing import List, Optional
-from collections import defaultdict
 
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 
+# msgpack 설치 시 바이너리 요청 본문 / 결과 응답 지원
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# orjson 설치 시 응답 직렬화에 사용 (numpy 타입을 C 레벨에서 직접 변환)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import system_config
 from scanner import QuantScanner
 from risk_manager import risk_manager
-from report_generator import ReportGenerator
+from report_generator import ReportGenerator, json_default
+from indicators_numba import grade_kernel
 from watchlist import watchlist_manager, TelegramWatchBot
 
 logger = logging.getLogger(__name__)
 
 
-def sanitize(obj):
-    """numpy 타입 → Python 기본 타입 재귀 변환"""
-    if isinstance(obj, dict):
-        return {k: sanitize(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [sanitize(v) for v in obj]
-    elif isinstance(obj, (np.bool_,)):
-        return bool(obj)
-    elif isinstance(obj, (np.integer,)):
-        return int(obj)
-    elif isinstance(obj, (np.floating,)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    return obj
+class NumpyJSONResponse(JSONResponse):
+    """numpy 타입이 섞인 스캔 결과용 응답 — 사전 재귀 변환 없이 직렬화 시 default 훅으로 처리"""
+
+    def render(self, content) -> bytes:
+        if orjson:
+            return orjson.dumps(
+                content,
+                default=json_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False,
+            separators=(",", ":"), default=json_default,
+        ).encode("utf-8")
 
 
 # ──────────────────────────────────────────
@@ -51,6 +65,17 @@ def sanitize(obj):
 # 2단계: 수급 동기화  → 외인/기관/프로그램 중 2개 이상 매수세
 # 3단계: 시장 환경   → 코스피/코스닥 MA5 위 (상승 추세)
 # ──────────────────────────────────────────
+# 등급 코드 → (등급, 라벨) — 코드 순서가 곧 정렬 우선순위 (B+ 두 종류는 같은 순위)
+_GRADES = (
+    ("S", "S급 (3중 교집합 + 수급 + 시장)"),
+    ("A", "A급 (교집합 AND 필터 통과)"),
+    ("B+", "패턴 중첩 O / 수급 미달 ({buy}/2)"),
+    ("B+", "패턴+수급 O / 시장 환경 미달 (하락장)"),
+    ("B", "단일 전략"),
+)
+_GRADE_RANK = np.array([0, 1, 2, 2, 3])
+
+
 def analyze_intersections(signals: list, market_condition=None) -> list:
     """
     3단계 교집합(AND) 필터 — 시그널을 분석하여 등급 부여
@@ -58,6 +83,9 @@ def analyze_intersections(signals: list, market_condition=None) -> list:
     """
     from data_collector import collector
 
+    if not signals:
+        return []
+
     # 시장 상태 조회 (없으면 새로 분석)
     if market_condition is None:
         try:
@@ -65,109 +93,89 @@ def analyze_intersections(signals: list, market_condition=None) -> list:
         except Exception:
             market_condition = None
 
-    # ── 종목별 그룹핑 ──
-    by_ticker = defaultdict(list)
-    for s in signals:
-        by_ticker[s.get("ticker", "")].append(s)
-
-    enriched = []
-
-    for ticker, group in by_ticker.items():
-        strategies = list(set(g["strategy"] for g in group))
-        pattern_count = len(strategies)
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 1단계: 패턴 중첩 검증
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        filter1_pass = pattern_count >= 2
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 2단계: 수급 동기화 (외인/기관/프로그램)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        supply_demand = {"buy_count": 0, "details": {}, "acceleration": {"label": "분석 중"}}
-        filter2_pass = False
-
-        if filter1_pass:
-            try:
-                supply_demand = collector.get_supply_demand(ticker)
-                filter2_pass = supply_demand.get("buy_count", 0) >= 2
-            except Exception:
-                filter2_pass = False
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 3단계: 시장 환경 (MA5 위 = 상승 추세)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        filter3_pass = False
-        market_phase = "UNKNOWN"
-
-        if filter1_pass and filter2_pass:
-            if market_condition:
-                market_phase = getattr(market_condition, "market_phase", "UNKNOWN")
-                # BULL 또는 NEUTRAL 이면 통과 (BEAR만 차단)
-                kospi_ok = getattr(market_condition, "kospi_above_ma5", False)
-                kosdaq_ok = getattr(market_condition, "kosdaq_above_ma5", False)
-                filter3_pass = kospi_ok or kosdaq_ok
-            else:
-                filter3_pass = True  # 시장 데이터 없으면 패스
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 최종 등급 부여
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        all_pass = filter1_pass and filter2_pass and filter3_pass
-
-        for s in group:
-            s["multi_strategy_count"] = pattern_count
-            s["multi_strategies"] = strategies
-            s["supply_acceleration"] = supply_demand.get("acceleration", {}).get("label", "")
-
-            # 핵심 근거에 수급 가속도 추가 (V2)
-            if s["supply_acceleration"] and s["supply_acceleration"] != "수급 완만":
-                if "reasons" not in s: s["reasons"] = []
-                s["reasons"].insert(0, f"🚀 수급 가속: {s['supply_acceleration']}")
-
-            # 필터 통과 기록
-            s["filter_results"] = {
-                "pattern_overlap": filter1_pass,
-                "pattern_count": pattern_count,
-                "supply_sync": filter2_pass,
-                "supply_buy_count": supply_demand.get("buy_count", 0),
-                "supply_details": supply_demand.get("details", {}),
-                "market_ok": filter3_pass,
-                "market_phase": market_phase,
-            }
-
-            if all_pass and pattern_count >= 3:
-                s["grade"] = "S"
-                s["grade_label"] = "S급 (3중 교집합 + 수급 + 시장)"
-                s["verdict"] = "매수 승인"
-            elif all_pass and pattern_count >= 2:
-                s["grade"] = "A"
-                s["grade_label"] = "A급 (교집합 AND 필터 통과)"
-                s["verdict"] = "매수 승인"
-            elif filter1_pass and not filter2_pass:
-                s["grade"] = "B+"
-                s["grade_label"] = f"패턴 중첩 O / 수급 미달 ({supply_demand.get('buy_count', 0)}/2)"
-            elif filter1_pass and filter2_pass and not filter3_pass:
-                s["grade"] = "B+"
-                s["grade_label"] = "패턴+수급 O / 시장 환경 미달 (하락장)"
-            else:
-                s["grade"] = "B"
-                s["grade_label"] = "단일 전략"
-
-            # 보너스 없음 — 원본 신뢰도 유지
-            s["confidence_bonus"] = 0
-            s["original_confidence"] = s.get("confidence", 0)
-
-            enriched.append(s)
-
-    # S급 → A급 → B+ → B 순, 같은 등급 내 신뢰도 높은 순
-    grade_order = {"S": 0, "A": 1, "B+": 2, "B": 3}
-    enriched.sort(key=lambda x: (
-        grade_order.get(x.get("grade", "B"), 3),
-        -x.get("confidence", 0)
-    ))
-
-    return enriched
+    # ── 종목별 그룹핑 (신호 순서 = 행 순서, 그룹 번호는 첫 등장 순) ──
+    frame = pd.DataFrame({
+        "ticker": [s.get("ticker", "") for s in signals],
+        "strategy": [s["strategy"] for s in signals],
+    })
+    grouped = frame.groupby("ticker", sort=False)["strategy"]
+    strategies = {t: list(u) for t, u in grouped.unique().items()}
+    pattern_count = grouped.transform("nunique").to_numpy(dtype=np.int64)
+    group_rank = grouped.ngroup().to_numpy()
+    tickers = frame["ticker"].tolist()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 1단계: 패턴 중첩 (종목별 전략 2개 이상)
+    # 2단계: 수급 동기화 (외인/기관/프로그램)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 1단계 통과 종목(2개 이상 전략)의 수급을 한 번에 병렬 조회 — 종목별 순차 호출 제거
+    tickers_f1 = [t for t, u in strategies.items() if len(u) >= 2]
+    try:
+        sd_map = collector.batch_supply_demand(tickers_f1) if tickers_f1 else {}
+    except Exception:
+        sd_map = {}
+    supply = {
+        t: sd_map.get(t) or {"buy_count": 0, "details": {}, "acceleration": {"label": "분석 중"}}
+        for t in strategies
+    }
+    buy_count = np.array([supply[t].get("buy_count", 0) for t in tickers], dtype=np.int64)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 3단계: 시장 환경 (MA5 위 = 상승 추세)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    market_ok, phase = True, "UNKNOWN"  # 시장 데이터 없으면 패스
+    if market_condition:
+        phase = getattr(market_condition, "market_phase", "UNKNOWN")
+        # BULL 또는 NEUTRAL 이면 통과 (BEAR만 차단)
+        market_ok = getattr(market_condition, "kospi_above_ma5", False) or \
+            getattr(market_condition, "kosdaq_above_ma5", False)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 최종 등급 부여 (신호 전체 일괄 판정 — numba 커널)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    codes = np.empty(len(signals), dtype=np.int8)
+    grade_kernel(pattern_count, buy_count, bool(market_ok), codes)
+    f1 = codes != 4                   # 패턴 중첩
+    f2 = (codes <= 1) | (codes == 3)  # + 수급 동기화
+    f3 = codes <= 1                   # + 시장 환경
+
+    for i, s in enumerate(signals):
+        ticker = tickers[i]
+        supply_demand = supply[ticker]
+        s["multi_strategy_count"] = int(pattern_count[i])
+        s["multi_strategies"] = strategies[ticker]
+        s["supply_acceleration"] = supply_demand.get("acceleration", {}).get("label", "")
+
+        # 핵심 근거에 수급 가속도 추가 (V2)
+        if s["supply_acceleration"] and s["supply_acceleration"] != "수급 완만":
+            if "reasons" not in s: s["reasons"] = []
+            s["reasons"].insert(0, f"🚀 수급 가속: {s['supply_acceleration']}")
+
+        # 필터 통과 기록
+        s["filter_results"] = {
+            "pattern_overlap": bool(f1[i]),
+            "pattern_count": int(pattern_count[i]),
+            "supply_sync": bool(f2[i]),
+            "supply_buy_count": supply_demand.get("buy_count", 0),
+            "supply_details": supply_demand.get("details", {}),
+            "market_ok": bool(f3[i]),
+            "market_phase": phase if f2[i] else "UNKNOWN",
+        }
+
+        code = int(codes[i])
+        s["grade"], label = _GRADES[code]
+        s["grade_label"] = label.format(buy=supply_demand.get("buy_count", 0)) if code == 2 else label
+        if code <= 1:
+            s["verdict"] = "매수 승인"
+
+        # 보너스 없음 — 원본 신뢰도 유지
+        s["confidence_bonus"] = 0
+        s["original_confidence"] = s.get("confidence", 0)
+
+    # S급 → A급 → B+ → B 순, 같은 등급 내 신뢰도 높은 순 (동률은 종목 그룹 → 원래 순서)
+    confidence = np.array([s.get("confidence", 0) for s in signals], dtype=np.float64)
+    order = np.lexsort((np.arange(len(signals)), group_rank, -confidence, _GRADE_RANK[codes]))
+    return [signals[i] for i in order]
 
 
 app = FastAPI(
@@ -192,6 +200,8 @@ if os.path.exists(dashboard_dir):
 # 글로벌 스캐너 인스턴스
 scanner = QuantScanner()
 latest_results = {"signals": [], "market_condition": {}, "summary": {}}
+# 저장 파일 기반 결과 캐시 (경로·mtime 이 같으면 재로딩/교집합 재분석 생략)
+_results_cache = {"path": None, "mtime": 0, "payload": None}
 
 
 # ══════════════════════════════════════
@@ -216,23 +226,10 @@ async def get_progress():
 # ══════════════════════════════════════
 # 스캔 API (교집합 포함)
 # ══════════════════════════════════════
-@app.get("/api/scan")
-async def run_scan(
-    min_market_cap: Optional[int] = None,
-    top_rank: Optional[int] = None,
-    strats: Optional[str] = None,
-    vars: Optional[str] = None
-):
-    """전체 스캔 실행 + 교집합 분석 (동적 파라미터 지원)"""
+async def _execute_scan(params: dict) -> JSONResponse:
+    """스캔 실행 + 교집합 분석 공통 처리"""
     global latest_results
     try:
-        # 파라미터 구성
-        params = {}
-        if min_market_cap is not None: params["min_market_cap"] = min_market_cap
-        if top_rank is not None: params["top_rank"] = top_rank
-        if strats: params["strategies"] = strats.split(",")
-        if vars: params["vars"] = json.loads(vars)
-
         # 무거운 스캔 작업을 스레드풀에서 실행 (메인 루프 차단 방지)
         results = await run_in_threadpool(scanner.run_scan, scan_params=params)
 
@@ -256,7 +253,7 @@ async def run_scan(
             }
 
         latest_results = results
-        return JSONResponse(content=sanitize(results))
+        return NumpyJSONResponse(content=results)
     except Exception as e:
         logger.error(f"스캔 오류: {e}")
         return JSONResponse(
@@ -265,25 +262,107 @@ async def run_scan(
         )
 
 
+def _build_scan_params(min_market_cap, top_rank, strats) -> dict:
+    params = {}
+    if min_market_cap is not None: params["min_market_cap"] = min_market_cap
+    if top_rank is not None: params["top_rank"] = top_rank
+    if strats: params["strategies"] = strats.split(",")
+    return params
+
+
+@app.get("/api/scan")
+async def run_scan(
+    min_market_cap: Optional[int] = None,
+    top_rank: Optional[int] = None,
+    strats: Optional[str] = None,
+    vars: Optional[str] = None
+):
+    """전체 스캔 실행 + 교집합 분석 (동적 파라미터 지원)"""
+    params = _build_scan_params(min_market_cap, top_rank, strats)
+    if vars: params["vars"] = json.loads(vars)
+    return await _execute_scan(params)
+
+
+@app.post("/api/scan")
+async def run_scan_post(
+    request: Request,
+    min_market_cap: Optional[int] = None,
+    top_rank: Optional[int] = None,
+    strats: Optional[str] = None,
+):
+    """전체 스캔 실행 — 전략 파라미터(vars)를 본문(msgpack 또는 JSON)으로 수신"""
+    params = _build_scan_params(min_market_cap, top_rank, strats)
+    body = await request.body()
+    if body:
+        if request.headers.get("content-type", "").startswith("application/msgpack"):
+            if msgpack is None:
+                return JSONResponse(content={"error": "msgpack 미설치"}, status_code=415)
+            params["vars"] = msgpack.unpackb(body)
+        else:
+            params["vars"] = json.loads(body)
+    return await _execute_scan(params)
+
+
+def _latest_result_file() -> Optional[str]:
+    """가장 최근 scan_result_*.json 경로 (결과 폴더 → 현재 폴더 순으로 탐색)"""
+    for d in (system_config.results_dir, "."):
+        if not os.path.isdir(d):
+            continue
+        files = sorted(glob.glob(os.path.join(d, "scan_result_*.json")), reverse=True)
+        if files:
+            return files[0]
+    return None
+
+
+def _load_result_file(path: str) -> dict:
+    """결과 파일 로드 — 같은 시각의 .msgpack 이 있으면 바이너리로 파싱"""
+    packed = path[:-len(".json")] + ".msgpack"
+    if msgpack and os.path.exists(packed):
+        try:
+            with open(packed, "rb") as f:
+                return msgpack.unpackb(f.read(), strict_map_key=False)
+        except Exception:
+            pass  # 기록 중인 파일 등 → JSON 으로
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 @app.get("/api/results")
-async def get_results():
-    """최근 스캔 결과 반환"""
+async def get_results(format: Optional[str] = None):
+    """최근 스캔 결과 반환 (?format=msgpack 이면 application/msgpack)"""
+    data = latest_results
     if not latest_results.get("signals"):
         try:
-            files = sorted(
-                [f for f in os.listdir(".") if f.startswith("scan_result_")],
-                reverse=True,
-            )
-            if files:
-                with open(files[0], "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # 저장된 결과에도 교집합 적용
+            latest = _latest_result_file()
+            if latest:
+                mtime = os.stat(latest).st_mtime_ns
+                if _results_cache["path"] == latest and _results_cache["mtime"] == mtime:
+                    data = _results_cache["payload"]
+                else:
+                    data = _load_result_file(latest)
+                    # 저장된 결과에도 교집합 적용 (수급 조회 포함 — 파일이 바뀔 때만)
                     if data.get("signals"):
-                        data["signals"] = analyze_intersections(data["signals"])
-                    return JSONResponse(content=data)
+                        data["signals"] = await run_in_threadpool(analyze_intersections, data["signals"])
+                    _results_cache.update(path=latest, mtime=mtime, payload=data)
         except Exception:
-            pass
-    return JSONResponse(content=latest_results)
+            data = latest_results
+    if format == "msgpack" and msgpack:
+        return Response(
+            content=msgpack.packb(data, default=json_default, use_bin_type=True),
+            media_type="application/msgpack",
+        )
+    return NumpyJSONResponse(content=data)
+
+
+@app.get("/api/results/columnar")
+async def get_results_columnar(request: Request):
+    """최근 스캔 결과 (컬럼형) — Accept: application/octet-stream 이면 npz 바이너리"""
+    cols = scanner.get_latest_results_columnar()
+    if "application/octet-stream" in request.headers.get("accept", ""):
+        buf = io.BytesIO()
+        np.savez(buf, **cols)
+        return Response(content=buf.getvalue(), media_type="application/octet-stream")
+    return NumpyJSONResponse(content=cols)
 
 
 @app.get("/api/market")
@@ -291,8 +370,8 @@ async def get_market_condition():
     """시장 상태 분석"""
     try:
         condition = risk_manager.analyze_market_condition()
-        return JSONResponse(
-            content=sanitize(ReportGenerator.market_condition_to_dict(condition))
+        return NumpyJSONResponse(
+            content=ReportGenerator.market_condition_to_dict(condition)
         )
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
@@ -306,11 +385,11 @@ async def analyze_stock(ticker: str):
         signals = engine.scan_all_strategies(ticker)
         results = [ReportGenerator.signal_to_dict(s) for s in signals]
         results = analyze_intersections(results)
-        return JSONResponse(content=sanitize({
+        return NumpyJSONResponse(content={
             "ticker": ticker,
             "signals": results,
             "total": len(results),
-        }))
+        })
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
@@ -335,7 +414,7 @@ async def approve_signal(ticker: str, request: Request):
 async def get_watchlist():
     """관찰 리스트 전체 조회"""
     items = watchlist_manager.get_all()
-    return JSONResponse(content=sanitize([i.to_dict() for i in items]))
+    return NumpyJSONResponse(content=[i.to_dict() for i in items])
 
 
 @app.post("/api/watchlist/add")
@@ -354,7 +433,7 @@ async def add_watchlist(request: Request):
         )
 
     item = watchlist_manager.add(ticker, buy_price, name, quantity)
-    return JSONResponse(content=sanitize(item.to_dict()))
+    return NumpyJSONResponse(content=item.to_dict())
 
 
 @app.delete("/api/watchlist/{ticker}")
@@ -370,7 +449,7 @@ async def remove_watchlist(ticker: str):
 async def check_watchlist():
     """전 종목 현재가 체크 + 상태 업데이트"""
     results = watchlist_manager.check_all()
-    return JSONResponse(content=sanitize(results))
+    return NumpyJSONResponse(content=results)
 
 
 @app.get("/api/watchlist/report")
@@ -11,7 +11,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from enum import Enum
 
-from config import strategy_config, risk_config
+from config import strategy_config, risk_config, DATACLASS_SLOTS
 from indicators import TechnicalIndicators as TI
 from data_collector import collector
 
@@ -32,7 +32,7 @@ class StrategyType(str, Enum):
 # ──────────────────────────────────────────
 # 전략 판별 결과
 # ──────────────────────────────────────────
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StrategySignal:
     """전략 판별 결과"""
     ticker: str = ""
@@ -52,6 +52,16 @@ class StrategySignal:
     details: Dict = field(default_factory=dict)
     verdict: str = "관망"             # "매수 승인" / "관망"
 
+    def finalize(self) -> "StrategySignal":
+        """가격 필드를 원 단위 정수로 확정 (판별 완료 시 1회 — 이후 포맷/직렬화에서 재변환 없음)"""
+        self.current_price = int(round(self.current_price))
+        self.entry_price_1 = int(round(self.entry_price_1))
+        self.entry_price_2 = int(round(self.entry_price_2))
+        self.target_price_1 = int(round(self.target_price_1))
+        self.target_price_2 = int(round(self.target_price_2))
+        self.stop_loss = int(round(self.stop_loss))
+        return self
+
 
 class StrategyEngine:
     """5대 전략 판별 엔진"""
@@ -157,6 +167,7 @@ class StrategyEngine:
                 max(signal.entry_price_1 - signal.stop_loss, 1), 2
             )
             signal.verdict = "매수 승인" if signal.confidence >= 75 else "관망"
+            signal.finalize()
 
         signal.details = {
             "기준봉": ref,
@@ -227,7 +238,7 @@ class StrategyEngine:
         has_accum = len(accum) > 0
         if has_accum:
             signal.reasons.append(
-                f"매집봉 {len(accum)}개 감지 (최대 거래량 배수: {accum[0]['거래량배수']}x)"
+                f"매집봉 {len(accum)}개 감지 (최대 거래량 배수: {round(float(accum['vol_ratio'][0]), 2)}x)"
             )
 
         # ④ 종합 판별
@@ -260,6 +271,7 @@ class StrategyEngine:
                 max(signal.entry_price_1 - signal.stop_loss, 1), 2
             )
             signal.verdict = "매수 승인" if (signal.confidence >= 70 and no_wall) else "관망"
+            signal.finalize()
 
         signal.details = {
             "매물대분석": resistance,
@@ -370,6 +382,7 @@ class StrategyEngine:
                 max(signal.entry_price_1 - signal.stop_loss, 1), 2
             )
             signal.verdict = "매수 승인" if (signal.confidence >= 75 and slope_ok) else "관망"
+            signal.finalize()
 
         signal.details = {
             "RSI": round(rsi_today, 1),
@@ -477,6 +490,7 @@ class StrategyEngine:
                 max(signal.entry_price_1 - signal.stop_loss, 1), 2
             )
             signal.verdict = "매수 승인" if (is_breakout and signal.confidence >= 70) else "관망"
+            signal.finalize()
 
         signal.details = {
             "박스권": box,
@@ -572,6 +586,7 @@ class StrategyEngine:
             signal.verdict = "매수 승인" if (
                 signal.confidence >= 70 and conv.get("is_aligned") and conv.get("diverging")
             ) else "관망"
+            signal.finalize()
 
         signal.details = {
             "밀집도분석": conv,
@@ -579,6 +594,49 @@ class StrategyEngine:
         }
         return signal
 
+    # ══════════════════════════════════════
+    # 일괄 사전 선별 (일봉 조기 탈락 조건)
+    # ══════════════════════════════════════
+    def prescreen(self, ohlcv_map: Dict[str, pd.DataFrame]) -> Dict[str, set]:
+        """
+        check_* 의 일봉 첫 관문을 전 종목 (N, k) 배열로 일괄 판정 → {전략키: 통과 종목}
+        - 탈락 종목은 개별 판별 시에도 미발동이므로 호가/수급 조회 생략 가능
+        - 결과에 없는 전략은 전 종목 개별 판별
+        - add_all_ma / add_panel_indicators 로 MA 컬럼이 채워진 뒤 호출
+        """
+        frames = {t: df for t, df in ohlcv_map.items() if len(df) >= 30}
+        be = self.params.bottom_escape
+        gc = self.params.golden_cross
+        return {
+            "bottom_escape": self._pass_ma_breakout(frames, f"MA{be.ma_period}"),
+            "golden_cross": self._pass_recent_cross(frames, f"MA{gc.short_ma}", f"MA{gc.long_ma}"),
+        }
+
+    @staticmethod
+    def _tails(frames: Dict[str, pd.DataFrame], tickers: List[str], col: str, k: int) -> np.ndarray:
+        return np.vstack([frames[t][col].to_numpy(dtype=np.float64)[-k:] for t in tickers])
+
+    def _pass_ma_breakout(self, frames: Dict[str, pd.DataFrame], ma_col: str) -> set:
+        """바닥탈출 ①: 종가 > MA 이면서 전일 MA 이하 또는 최근 3일 내 MA 아래 종가"""
+        tickers = [t for t, df in frames.items() if ma_col in df.columns]
+        if not tickers:
+            return set()
+        c = self._tails(frames, tickers, "종가", 4)
+        m = self._tails(frames, tickers, ma_col, 4)
+        recent_below = (c[:, -2] <= m[:, -2]) | (c[:, :-1] < m[:, :-1]).any(axis=1)
+        ok = (c[:, -1] > m[:, -1]) & recent_below
+        return {t for t, hit in zip(tickers, ok) if hit}
+
+    def _pass_recent_cross(self, frames: Dict[str, pd.DataFrame], short_col: str, long_col: str) -> set:
+        """골든크로스 ①: 최근 3일 이내 단기 MA 가 장기 MA 를 상향 돌파"""
+        tickers = [t for t, df in frames.items() if short_col in df.columns and long_col in df.columns]
+        if not tickers:
+            return set()
+        s = self._tails(frames, tickers, short_col, 4)
+        l = self._tails(frames, tickers, long_col, 4)
+        ok = ((s[:, :-1] < l[:, :-1]) & (s[:, 1:] >= l[:, 1:])).any(axis=1)
+        return {t for t, hit in zip(tickers, ok) if hit}
+
     # ══════════════════════════════════════
     # 전체 전략 스캔
     # ══════════════════════════════════════
@@ -14,6 +14,8 @@ from config import supabase_config
 
 logger = logging.getLogger(__name__)
 
+_REPORT_RULE = "━" * 36  # 텔레그램 보고서 구분선
+
 # ──────────────────────────────────────────
 # Supabase REST API 헬퍼
 # ──────────────────────────────────────────
@@ -226,18 +228,18 @@ def check_and_update_all() -> List[Dict]:
             ma20 = 0
             ma20_break = False
             try:
-                from indicators import TechnicalIndicators as TI
+                from indicators import online_update
                 df = collector.get_ohlcv(ticker, 30)
                 if not df.empty and len(df) >= system_config.ma_stop_period:
-                    df = TI.add_all_ma(df, [system_config.ma_stop_period])
+                    # 1분 주기 감시 → 증분 갱신 (새 봉/당일 봉 변경분만 반영)
                     ma_col = f"MA{system_config.ma_stop_period}"
-                    if ma_col in df.columns:
-                        ma20 = float(df[ma_col].iloc[-1])
-                        if len(df) >= 2:
-                            y_close = float(df["종가"].iloc[-2])
-                            y_ma = float(df[ma_col].iloc[-2])
-                            if y_close > y_ma and current_price < ma20:
-                                ma20_break = True
+                    vals = online_update(ticker, df, (system_config.ma_stop_period,))
+                    ma20 = float(vals[ma_col])
+                    if len(df) >= 2:
+                        y_close = float(df["종가"].iloc[-2])
+                        y_ma = float(vals[f"{ma_col}_prev"])
+                        if y_close > y_ma and current_price < ma20:
+                            ma20_break = True
             except Exception:
                 pass
 
@@ -300,10 +302,10 @@ def generate_daily_summary() -> str:
         return "📋 보유 종목이 없습니다."
 
     lines = [
-        "━" * 36,
+        _REPORT_RULE,
         "📊 일일 포트폴리오 요약",
         f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        "━" * 36, "",
+        _REPORT_RULE, "",
     ]
 
     total_pnl = 0
@@ -333,12 +335,12 @@ def generate_daily_summary() -> str:
         if h.get("status") in ("경고", "손절도달"):
             danger.append(h.get("name", ""))
 
-    lines.append("━" * 36)
+    lines.append(_REPORT_RULE)
     lines.append(f"💰 총 손익: {int(total_pnl):+,}원")
     lines.append(f"📈 보유: {len(holdings)}개 / ⚠️ 주의: {len(danger)}개")
     if danger:
         lines.append(f"   → {', '.join(danger)}")
-    lines.append("━" * 36)
+    lines.append(_REPORT_RULE)
 
     return "\n".join(lines)
 
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field, asdict
 
+import requests
+
 from config import kis_config, risk_config, telegram_config
 from data_collector import collector
 from indicators import TechnicalIndicators as TI
@@ -20,6 +22,7 @@ from indicators import TechnicalIndicators as TI
 logger = logging.getLogger(__name__)
 
 WATCHLIST_FILE = "watchlist.json"
+_REPORT_RULE = "━" * 36  # 텔레그램 보고서 구분선
 
 
 # ──────────────────────────────────────────
@@ -274,10 +277,10 @@ class WatchlistManager:
         self.check_all()
 
         lines = [
-            "━" * 36,
+            _REPORT_RULE,
             "📊 일일 포트폴리오 요약",
             f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            "━" * 36,
+            _REPORT_RULE,
             "",
         ]
 
@@ -314,13 +317,13 @@ class WatchlistManager:
             if item.pnl_pct > 0:
                 profit_items.append(item.name)
 
-        lines.append("━" * 36)
+        lines.append(_REPORT_RULE)
         lines.append(f"💰 총 손익: {int(total_pnl):+,}원")
         lines.append(f"📈 수익 종목: {len(profit_items)}개")
         lines.append(f"⚠️ 주의 종목: {len(danger_items)}개")
         if danger_items:
             lines.append(f"   → {', '.join(danger_items)}")
-        lines.append("━" * 36)
+        lines.append(_REPORT_RULE)
 
         return "\n".join(lines)
 
@@ -415,7 +418,6 @@ class WatchlistManager:
             return
 
         try:
-            import requests
             url = f"https://api.telegram.org/bot{telegram_config.bot_token}/sendMessage"
             payload = {
                 "chat_id": telegram_config.chat_id,
@@ -482,7 +484,6 @@ class TelegramWatchBot:
 
     def _poll_loop(self):
         """텔레그램 메시지 폴링"""
-        import requests
         while self._running:
             try:
                 url = (
@@ -611,7 +612,6 @@ class TelegramWatchBot:
     def _reply(self, chat_id, text: str):
         """텔레그램 응답"""
         try:
-            import requests
             url = f"https://api.telegram.org/bot{telegram_config.bot_token}/sendMessage"
             requests.post(url, json={
                 "chat_id": chat_id,